@@ -1,4 +1,5 @@
 import os
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -6,26 +7,47 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
+
+# The single .env source: merged into os.environ, where Settings and the lazy secrets below read it
 load_dotenv(dotenv_path=dotenv_path)
 
 class Settings(BaseSettings):
-    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+    ENVIRONMENT: str = "development"
     PROJECT_NAME: str = "BoligAnalyse API"
     API_V1_STR: str = "/api/v1"
-    SUPABASE_URL: str = os.getenv("SUPABASE_URL", "YOUR_DEFAULT_SUPABASE_URL")
-    SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_KEY", "YOUR_DEFAULT_ANON_KEY")
-    SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "YOUR_DEFAULT_SERVICE_KEY")
-    ANTHROPIC_API_KEY: Optional[str] = os.getenv("ANTHROPIC_API_KEY", None)
-    FIRECRAWL_API_KEY: Optional[str] = os.getenv("FIRECRAWL_API_KEY", None)
+    SUPABASE_URL: str = "YOUR_DEFAULT_SUPABASE_URL"
+    SUPABASE_ANON_KEY: str = "YOUR_DEFAULT_ANON_KEY"
+    SUPABASE_SERVICE_ROLE_KEY: str = "YOUR_DEFAULT_SERVICE_KEY"
+    # Upper bounds on in-flight requests to rate-limited upstreams
+    FIRECRAWL_MAX_CONCURRENCY: int = 16
+    BOLIGSIDEN_MAX_CONCURRENCY: int = 32
+    # Uvicorn worker processes when started via `python -m src.app.main`; in-process caches are per worker
+    UVICORN_WORKERS: int = 1
     model_config = SettingsConfigDict(
-        env_file=dotenv_path,
-        env_file_encoding='utf-8',
         case_sensitive=True,
-        extra='ignore'
+        extra='ignore',
+        frozen=True,  # Shared via get_settings(), so it must not be mutated
+        validate_assignment=False,
     )
 
+    # Optional secrets are resolved on first access rather than at construction,
+    # so request paths that never touch them skip the lookup entirely.
+    @cached_property
+    def ANTHROPIC_API_KEY(self) -> Optional[str]:
+        return os.environ.get("ANTHROPIC_API_KEY")
+
+    @cached_property
+    def FIRECRAWL_API_KEY(self) -> Optional[str]:
+        return os.environ.get("FIRECRAWL_API_KEY")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Returns the process-wide Settings instance, constructed on first call."""
+    return Settings()
+
 
-settings = Settings()
+settings = get_settings()
 
 if not settings.SUPABASE_URL or "YOUR_DEFAULT" in settings.SUPABASE_URL:
     print("WARNING: SUPABASE_URL is not configured properly.")
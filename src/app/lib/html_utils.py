@@ -1,7 +1,10 @@
+import asyncio
 import logging
+import re
+import threading
 import httpx
-from typing import Optional, Union, List, Any, cast
-from bs4 import BeautifulSoup, Comment, Tag, NavigableString, PageElement, ResultSet
+from typing import Optional, Union, List
+from lxml import etree, html
 from .url_utils import resolve_url
 
 logger = logging.getLogger(__name__)
@@ -11,148 +14,247 @@ TEXT_IGNORE_TAGS: List[str] = ['script', 'style', 'noscript', 'iframe', 'header'
 # Elements that often contain main content (can be used for targeted extraction if needed)
 # CONTENT_TAGS = ['main', 'article', 'section', 'div[role="main"]']
 
-async def extract_text_from_html(html_content: str) -> str:
+# Text nodes of an element that are not inside an ignored tag, evaluated entirely in libxml2
+_BODY_TEXT_XPATH: etree.XPath = etree.XPath(
+    ".//text()[not(" + " or ".join(f"ancestor::{tag}" for tag in TEXT_IGNORE_TAGS) + ")]",
+    smart_strings=False,
+)
+
+# Meta tag names that carry a Twitter card image
+_TWITTER_IMAGE_NAMES: frozenset[str] = frozenset({'twitter:image', 'twitter:image:src'})
+# Image URLs containing any of these are icons, placeholders or inline data rather than listing photos
+_BAD_IMG_MARKERS: tuple[str, ...] = (
+    '.svg', 'base64,', 'logo', 'icon', 'avatar', 'spinner', 'loading', 'placeholder'
+)
+_BAD_IMG_RE: re.Pattern[str] = re.compile(
+    '|'.join(re.escape(marker) for marker in _BAD_IMG_MARKERS), re.IGNORECASE
+)
+# Non-empty <img> srcs without a bad marker, filtered inside libxml2 so Python
+# only sees plausible candidates. The lowercased src is compared against each marker.
+_LOWERED_SRC = "translate(@src, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_IMG_CANDIDATES_XPATH: etree.XPath = etree.XPath(
+    "//img[@src != ''][not("
+    + " or ".join(f"contains({_LOWERED_SRC}, '{marker}')" for marker in _BAD_IMG_MARKERS)
+    + ")]/@src",
+    smart_strings=False,
+)
+
+HtmlInput = Union[str, bytes, html.HtmlElement]
+
+# lxml parsers are reusable but must not be shared between threads, so each thread keeps its own
+_parser_local = threading.local()
+
+
+def _get_html_parser() -> html.HTMLParser:
+    parser: Optional[html.HTMLParser] = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = html.HTMLParser(recover=True, no_network=True, huge_tree=False)
+        _parser_local.parser = parser
+    return parser
+
+
+def parse_html_tree(html_content: Union[str, bytes]) -> html.HtmlElement:
     """
-    Extracts readable text content from HTML using BeautifulSoup.
-    Removes scripts, styles, comments, and other non-content elements.
+    Parses an HTML document once so the result can be shared between
+    extract_text_from_html and extract_first_image_url.
+    Neither helper modifies the tree it is given.
+    Bytes are handed to lxml as-is and decoded according to the document's <meta charset>.
+    A document with no elements (whitespace or comments only) gives an empty <html> tree.
     """
+    if isinstance(html_content, str) and html_content.lstrip().startswith('<?xml'):
+        # lxml rejects str input with an encoding declaration (XHTML pages); the text is
+        # already decoded, so the declaration carries nothing and can be dropped.
+        _, sep, tail = html_content.lstrip().partition('?>')
+        if sep:
+            html_content = tail
+    try:
+        return html.document_fromstring(html_content, parser=_get_html_parser())
+    except etree.ParserError:
+        # "Document is empty": treat like empty input rather than a parse failure
+        return html.Element('html')
+
+
+def _as_tree(html_content: Optional[HtmlInput]) -> Optional[html.HtmlElement]:
+    """Returns a parsed tree for raw HTML, passes pre-parsed trees through, None for empty input."""
+    if isinstance(html_content, html.HtmlElement):
+        return html_content
     if not html_content:
-        return ""
+        return None
+    return parse_html_tree(html_content)
+
 
+def _extract_text(root: html.HtmlElement) -> str:
+    # Extract title and meta description first
+    title_text: str = ""
+    title_tag: Optional[html.HtmlElement] = root.find('.//title')
+    if title_tag is not None and title_tag.text:
+        title_text = title_tag.text.strip()
+
+    meta_desc_text: str = ""
+    meta_desc_tag: Optional[html.HtmlElement] = root.find(".//meta[@name='description']")
+    if meta_desc_tag is not None:
+        content = meta_desc_tag.get('content')
+        if content:
+            meta_desc_text = content.strip()
+
+    # Collect body text inside libxml2; comment nodes never match text().
+    body: html.HtmlElement = root.body if root.find('body') is not None else root
+    body_text: str = ' '.join(_BODY_TEXT_XPATH(body))
+
+    # Combine title, meta description, and body text
+    all_texts: List[str] = [text for text in [title_text, meta_desc_text, body_text] if text]
+    text: str = ' '.join(all_texts) # Join parts with spaces
+
+    # Final whitespace cleanup (consolidate multiple spaces, remove leading/trailing)
+    return ' '.join(text.split())
+
+
+def _extract_image(root: html.HtmlElement, base_url: str) -> Optional[str]:
+    # 1. Check common meta tags (og:image, twitter:image) in a single pass.
+    # og:image wins outright; the first twitter:image is kept as a fallback.
+    twitter_content: Optional[str] = None
+    for tag in root.iter('meta'):
+        content: Optional[str] = tag.get('content')
+        if content is None:
+            continue
+        property_value: Optional[str] = tag.get('property')
+        if property_value is not None and property_value.lower() == 'og:image':
+            logger.debug("Found image URL in og:image meta tag.")
+            return resolve_url(base_url, content)
+        if twitter_content is None:
+            name_value: Optional[str] = tag.get('name')
+            if name_value is not None and name_value.lower() in _TWITTER_IMAGE_NAMES:
+                twitter_content = content
+
+    if twitter_content is not None:
+        logger.debug("Found image URL in twitter:image meta tag.")
+        return resolve_url(base_url, twitter_content)
+
+    # 2. Look for image tags, prioritizing larger ones or those in specific containers
+    # Empty srcs are excluded by the XPath; they would otherwise resolve to the page URL itself.
+    # The resolved URL is re-checked since the base URL can contribute a marker.
+    for src in _IMG_CANDIDATES_XPATH(root):
+        # Absolute URLs need no joining against the base
+        resolved_src = src if src.startswith(('http://', 'https://')) else resolve_url(base_url, src)
+        if resolved_src and resolved_src.startswith('http') and \
+           not _BAD_IMG_RE.search(resolved_src):
+            logger.debug("Found potential image URL in img tag: %s", resolved_src)
+            return resolved_src
+
+    logger.debug("No suitable image URL found in meta tags or img tags.")
+    return None
+
+
+async def extract_text_from_html(html_content: Optional[HtmlInput]) -> str:
+    """
+    Extracts readable text content from HTML using lxml.
+    Removes scripts, styles, comments, and other non-content elements.
+    Accepts raw HTML or a tree from parse_html_tree.
+    """
     try:
-        soup: BeautifulSoup = BeautifulSoup(html_content, 'lxml') # Use lxml parser
-
-        # Extract title and meta description first
-        title_text: str = ""
-        if soup.title and isinstance(soup.title, Tag) and isinstance(soup.title.string, str):
-            title_text = soup.title.string.strip()
-            
-        meta_desc_tag: Optional[Tag] = cast(Optional[Tag], soup.find('meta', attrs={'name': 'description'}))
-        meta_desc_text: str = ""
-        if meta_desc_tag and meta_desc_tag.get('content'):
-            content = meta_desc_tag.get('content')
-            if isinstance(content, str):
-                meta_desc_text = content.strip()
-
-        # Remove ignored tags and comments from the body or main content area
-        body: Union[Tag, BeautifulSoup] = soup.body if soup.body else soup # Fallback to whole soup if no body
-        if body:
-             for element in body.find_all(TEXT_IGNORE_TAGS):
-                 element.decompose()
-             for comment in body.find_all(string=lambda text: isinstance(text, Comment)):
-                 comment.extract()
-        else: # Should not happen with valid HTML, but as a safeguard
-             for element in soup.find_all(TEXT_IGNORE_TAGS):
-                 element.decompose()
-             for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                 comment.extract()
-             body = soup # Use the cleaned soup
-
-        # Get text from the cleaned body
-        body_lines: List[str] = [line.strip() for line in body.stripped_strings] if body else []
-        body_text: str = ' '.join(body_lines) # Join with spaces
-
-        # Combine title, meta description, and body text
-        all_texts: List[str] = [text for text in [title_text, meta_desc_text, body_text] if text]
-        text: str = ' '.join(all_texts) # Join parts with spaces
-
-        # Get text, trying to preserve some structure with newlines
-        # text = soup.get_text(separator='\n', strip=True)
-
-        # Final whitespace cleanup (consolidate multiple spaces, remove leading/trailing)
-        text = ' '.join(text.split())
-
-        return text
+        root = _as_tree(html_content)
+        if root is None:
+            return ""
+        return _extract_text(root)
 
     except Exception as error:
-        logger.error("Failed to extract text from HTML with BeautifulSoup", exc_info=error)
+        logger.error("Failed to extract text from HTML with lxml", exc_info=error)
         # Fallback to simpler regex-based extraction? Or just return empty.
         return "" # Return empty string on error
 
-async def extract_first_image_url(html_content: str, base_url: str) -> Optional[str]:
+async def extract_first_image_url(html_content: Optional[HtmlInput], base_url: str) -> Optional[str]:
     """
-    Extract the first likely property image URL from HTML content using BeautifulSoup.
+    Extract the first likely property image URL from HTML content using lxml.
     Tries common meta tags first, then looks for large image elements.
     Resolves relative URLs using the provided base_url.
+    Accepts raw HTML or a tree from parse_html_tree.
     """
-    if not html_content:
-        return None
-
     try:
-        soup: BeautifulSoup = BeautifulSoup(html_content, 'lxml')
-
-        # 1. Check common meta tags (og:image, twitter:image)
-        # Find potential og:image tags (case-insensitive property check)
-        meta_tags_property: ResultSet[PageElement] = soup.find_all('meta', attrs={'property': True})
-        for tag in meta_tags_property:
-            if not isinstance(tag, Tag):
-                continue
-            property_value = tag.get('property', '')
-            if isinstance(property_value, str) and property_value.lower() == 'og:image':
-                content = tag.get('content')
-                if isinstance(content, str):
-                    logger.debug("Found image URL in og:image meta tag.")
-                    return resolve_url(base_url, content)
-
-        # Find potential twitter:image tags (case-insensitive name check)
-        meta_tags_name: ResultSet[PageElement] = soup.find_all('meta', attrs={'name': True})
-        for tag in meta_tags_name:
-            if not isinstance(tag, Tag):
-                continue
-            name_value = tag.get('name', '')
-            if isinstance(name_value, str) and name_value.lower() in ('twitter:image', 'twitter:image:src'):
-                content = tag.get('content')
-                if isinstance(content, str):
-                    logger.debug("Found image URL in twitter:image meta tag.")
-                    return resolve_url(base_url, content)
-
-        # 2. Look for image tags, prioritizing larger ones or those in specific containers
-        all_imgs: ResultSet[PageElement] = soup.find_all('img')
-        for img in all_imgs:
-            if not isinstance(img, Tag):
-                continue
-            src = img.get('src')
-            if isinstance(src, str):
-                resolved_src = resolve_url(base_url, src)
-                if resolved_src and resolved_src.startswith('http') and \
-                   '.svg' not in resolved_src.lower() and \
-                   'base64,' not in resolved_src.lower() and \
-                   'logo' not in resolved_src.lower() and \
-                   'icon' not in resolved_src.lower() and \
-                   'avatar' not in resolved_src.lower() and \
-                   'spinner' not in resolved_src.lower() and \
-                   'loading' not in resolved_src.lower() and \
-                   'placeholder' not in resolved_src.lower():
-                    logger.debug(f"Found potential image URL in img tag: {resolved_src}")
-                    return resolved_src
-
-        logger.debug("No suitable image URL found in meta tags or img tags.")
-        return None
+        root = _as_tree(html_content)
+        if root is None:
+            return None
+        return _extract_image(root, base_url)
 
     except Exception as error:
-        logger.error("Failed to extract first image URL with BeautifulSoup", exc_info=error)
+        logger.error("Failed to extract first image URL with lxml", exc_info=error)
         return None
 
 # HTML fetching utility
 HTTP_TIMEOUT: float = 30.0  # seconds
 USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+MAX_HTML_BYTES: int = 5 * 1024 * 1024  # Larger bodies are truncated
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client, creating it on first use so it binds to the running event loop.
+    Reusing one client keeps connections (and TLS sessions) alive between fetches.
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml"
+            },
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Closes the shared client. Called on application shutdown."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def fetch_html_content(url: str) -> str:
     """
     Fetch HTML content from a URL.
+    The body is streamed and truncated at MAX_HTML_BYTES to bound memory use.
     """
-    logger.info(f"Fetching HTML from {url}")
-    headers: dict[str, str] = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml"
-    }
-    
+    logger.info("Fetching HTML from %s", url)
+
     try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, follow_redirects=True) as client:
-            response = await client.get(url, headers=headers)
+        async with _get_http_client().stream('GET', url) as response:
             response.raise_for_status()
-            return response.text
-            
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    logger.warning("Response from %s exceeded %d bytes; truncating.", url, MAX_HTML_BYTES)
+                    del body[MAX_HTML_BYTES:]
+                    break
+            return body.decode(response.encoding or 'utf-8', errors='replace')
+
+    except httpx.HTTPError as e:
+        # Bad status codes, timeouts and connection errors are expected; no traceback needed
+        logger.warning("Error fetching URL %s: %s", url, e)
+        raise ValueError(f"Failed to fetch content from {url}") from e
     except Exception as e:
-        logger.error(f"Error fetching URL {url}: {e}", exc_info=True)
-        raise ValueError(f"Failed to fetch content from {url}")
\ No newline at end of file
+        logger.error("Unexpected error fetching URL %s: %s", url, e, exc_info=True)
+        raise ValueError(f"Failed to fetch content from {url}") from e
+
+
+async def fetch_many(urls: List[str], concurrency: int = 16) -> List[str]:
+    """
+    Fetch HTML content for several URLs concurrently over the shared client.
+    At most `concurrency` requests are in flight at once; results keep the order of `urls`.
+    Raises ValueError if any fetch fails.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch_one(url: str) -> str:
+        async with semaphore:
+            return await fetch_html_content(url)
+
+    return list(await asyncio.gather(*(_fetch_one(url) for url in urls)))
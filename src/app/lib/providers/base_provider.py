@@ -1,6 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Awaitable
+from typing import Dict, Any, Optional, Awaitable, ClassVar
 
 from src.app.schemas.parser import ParseResult # Import the new schema
 
@@ -13,6 +13,15 @@ logger = logging.getLogger(__name__)
 class BaseProvider(ABC):
     """Abstract base class for all real estate listing providers."""
 
+    # Hostnames this provider is dedicated to, as returned by extract_domain.
+    # The registry dispatches on these directly; providers without hostnames
+    # are generic and are only consulted through can_handle.
+    hostnames: ClassVar[tuple[str, ...]] = ()
+
+    # Providers live for the whole process; subclasses declare their instance
+    # attributes in __slots__ so instances carry no __dict__.
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
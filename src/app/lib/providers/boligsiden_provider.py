@@ -1,13 +1,17 @@
+import asyncio
 import logging
 import re
+import time
 import httpx
-from typing import Optional
-from urllib.parse import urlparse, parse_qs
+from collections import OrderedDict
+from typing import ClassVar, Optional
+from urllib.parse import quote, unquote
 from pydantic import HttpUrl
 from .base_provider import BaseProvider
 from src.app.schemas.parser import ParseResult
+from src.app.core.config import settings
 from src.app.lib import html_utils
-from src.app.lib.url_utils import extract_domain
+from src.app.lib.url_utils import extract_domain, to_http_url
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +19,131 @@ logger = logging.getLogger(__name__)
 HTTP_TIMEOUT = 30.0 # seconds
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+# Boilerplate phrases Boligsiden adds to every listing, fused into one
+# alternation so the extracted text is scanned once
+_COMBINED_PHRASE_RE = re.compile(
+    r"(?:Se hvilke internetforbindelser, der er tilgængelige på adressen\. Bemærk, at mobildækning ikke er oplyst\.)"
+    r"|(?:RadonrisikoRadonrisikoen vurderes til at være ukendtUkendt)",
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+# Only the udbud (case id) query parameter is needed from listing URLs
+_UDBUD_RE = re.compile(r"[?&]udbud=([^&#]+)")
+_REDIRECT_PREFIX = "https://www.boligsiden.dk/viderestilling/"
+
+# case_id -> (expiry, final_url). Listings get re-analysed, so successful redirect
+# resolutions are kept for a while; the TTL lets removed listings fall out.
+_SOURCE_URL_CACHE_SIZE = 1024
+_SOURCE_URL_TTL = 6 * 60 * 60  # seconds
+_source_url_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+_client: Optional[httpx.AsyncClient] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    Returns the shared redirect-resolving client, created on first use so it binds to the running event loop.
+    Keep-alive connections to boligsiden.dk are reused between listings.
+    """
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Bounds concurrent redirect lookups so batch analysis stays under Boligsiden's rate limits."""
+    global _semaphore
+
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.BOLIGSIDEN_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def _resolve_final_url(redirect_url: str) -> httpx.URL:
+    """
+    Follows redirect_url and returns the URL it lands on.
+    Only a single byte is requested and the body is never read; servers that
+    reject ranged requests get a plain GET instead.
+    """
+    client = _get_client()
+    async with client.stream("GET", redirect_url, headers={"Range": "bytes=0-0"}) as response:
+        if response.status_code not in (416, 501):
+            response.raise_for_status()
+            return response.url
+
+    response = await client.get(redirect_url)
+    response.raise_for_status()
+    return response.url
+
+
+def _get_cached_source_url(case_id: str) -> Optional[str]:
+    entry = _source_url_cache.get(case_id)
+    if entry is None:
+        return None
+    expires_at, final_url = entry
+    if expires_at < time.monotonic():
+        del _source_url_cache[case_id]
+        return None
+    _source_url_cache.move_to_end(case_id)
+    return final_url
+
+
+def _cache_source_url(case_id: str, final_url: str) -> None:
+    _source_url_cache[case_id] = (time.monotonic() + _SOURCE_URL_TTL, final_url)
+    _source_url_cache.move_to_end(case_id)
+    if len(_source_url_cache) > _SOURCE_URL_CACHE_SIZE:
+        _source_url_cache.popitem(last=False)
+
+
+async def _extract_page_text(html_content: str) -> str:
+    """
+    Parses in a worker thread (lxml releases the GIL), so neither the event loop nor a
+    concurrent redirect lookup waits on it. Logs and returns "" on failure.
+    """
+    try:
+        tree = await asyncio.to_thread(html_utils.parse_html_tree, html_content) if html_content else None
+    except Exception as error:
+        logger.error("Failed to parse HTML in BoligsidenProvider", exc_info=error)
+        return ""
+    return await html_utils.extract_text_from_html(tree)
+
+
+async def close_client() -> None:
+    """Closes the shared client. Called on application shutdown."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 class BoligsidenProvider(BaseProvider):
     """Provider implementation for Boligsiden.dk."""
 
+    hostnames: ClassVar[tuple[str, ...]] = ("www.boligsiden.dk",)
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return "Boligsiden.dk"
 
     def can_handle(self, url: str, html_content: Optional[str] = None) -> bool:
         """Checks if the URL is from boligsiden.dk."""
+        # Cheap substring reject before parsing the URL
+        if "boligsiden.dk" not in url.lower():
+            return False
         try:
             # Use extract_domain utility function
             domain = extract_domain(url)
-            return domain == "www.boligsiden.dk"
+            return domain in self.hostnames
         except Exception:
             return False
 
@@ -36,64 +152,66 @@ class BoligsidenProvider(BaseProvider):
         Extracts the original source URL by following Boligsiden's redirect.
         """
         try:
-            parsed_url = urlparse(url)
-            query_params = parse_qs(parsed_url.query)
-            udbud_list = query_params.get('udbud')
+            match = _UDBUD_RE.search(url)
+            case_id = unquote(match.group(1)) if match else None
 
-            if not udbud_list or not udbud_list[0]:
-                logger.info(f"No 'udbud' parameter found in Boligsiden URL: {url}")
+            if not case_id:
+                logger.info("No 'udbud' parameter found in Boligsiden URL: %s", url)
                 return None
 
-            case_id = udbud_list[0]
-            redirect_url = f"https://www.boligsiden.dk/viderestilling/{case_id}"
-            logger.warning(f"Following Boligsiden redirect URL: {redirect_url}")
+            cached_url = _get_cached_source_url(case_id)
+            if cached_url is not None:
+                return cached_url
 
-            headers = {"User-Agent": USER_AGENT,
-                       }
-            async with httpx.AsyncClient(follow_redirects=True, timeout=HTTP_TIMEOUT) as client:
-                # Use HEAD request to get final URL without downloading body
-                response = await client.get(redirect_url, headers=headers)
-                response.raise_for_status() # Check for errors
+            # case_id comes from user input; quote it so it can't alter the redirect path
+            redirect_url = _REDIRECT_PREFIX + quote(case_id, safe="")
+            logger.warning("Following Boligsiden redirect URL: %s", redirect_url)
 
-                final_url = str(response.url) # The URL after following redirects
-                logger.info(f"Resolved Boligsiden redirect to final URL: {final_url}")
+            async with _get_semaphore():
+                final_url = await _resolve_final_url(redirect_url)
+            logger.info("Resolved Boligsiden redirect to final URL: %s", final_url)
 
-                # Avoid returning the redirector URL itself if redirect failed somehow
-                if "boligsiden.dk/viderestilling" in final_url:
-                     logger.warning(f"Redirect did not resolve away from viderestilling for {url}")
-                     return None
+            # Avoid returning the redirector URL itself if redirect failed somehow
+            if final_url.host.endswith("boligsiden.dk") and final_url.path.startswith("/viderestilling"):
+                 logger.warning("Redirect did not resolve away from viderestilling for %s", url)
+                 return None
 
-                return final_url
+            source_url = str(final_url)
+            _cache_source_url(case_id, source_url)
+            return source_url
         except Exception as error:
-            logger.error(f"Failed to extract source URL from {url}", exc_info=error)
+            logger.error("Failed to extract source URL from %s", url, exc_info=error)
             return None
 
     async def parse_html(self, url: str, html_content: str) -> ParseResult:
 
         try:
-            extracted_text = await html_utils.extract_text_from_html(html_content)
-
-            original_link = await self._extract_source_url(url)
+            if _UDBUD_RE.search(url):
+                # The redirect lookup and the threaded parse run concurrently. Neither coroutine
+                # raises; both log and return an empty value on failure.
+                original_link, extracted_text = await asyncio.gather(
+                    self._extract_source_url(url),
+                    _extract_page_text(html_content),
+                )
+            else:
+                # Without a case id there is no source listing to resolve, but the page text
+                # is still the primary input for the analysis
+                logger.info("No 'udbud' parameter found in Boligsiden URL: %s", url)
+                original_link = None
+                extracted_text = await _extract_page_text(html_content)
 
             # Clean specific phrases from extracted text
-            phrases_to_remove = [
-                re.compile(r"Se hvilke internetforbindelser, der er tilgængelige på adressen\. Bemærk, at mobildækning ikke er oplyst\.", re.IGNORECASE),
-                re.compile(r"RadonrisikoRadonrisikoen vurderes til at være ukendtUkendt", re.IGNORECASE),
-            ]
-            cleaned_text = extracted_text
-            for phrase_re in phrases_to_remove:
-                cleaned_text = phrase_re.sub("", cleaned_text).strip()
+            cleaned_text = _COMBINED_PHRASE_RE.sub("", extracted_text)
 
             # Consolidate whitespace again after removals
-            cleaned_text = ' '.join(cleaned_text.split())
+            cleaned_text = _WS_RE.sub(" ", cleaned_text).strip()
 
             validated_original_link: Optional[HttpUrl] = None
 
             if original_link:
-                try:
-                    validated_original_link = HttpUrl(original_link)
-                except Exception:
-                    logger.warning(f"Extracted original link '{original_link}' is not a valid HttpUrl.")
+                validated_original_link = to_http_url(original_link)
+                if validated_original_link is None:
+                    logger.warning("Extracted original link '%s' is not a valid HttpUrl.", original_link)
 
             return ParseResult(
                 original_link=validated_original_link,
@@ -101,7 +219,7 @@ class BoligsidenProvider(BaseProvider):
             )
 
         except Exception as error:
-            logger.error(f"Failed to parse HTML with BoligsidenProvider for {url}", exc_info=error)
+            logger.error("Failed to parse HTML with BoligsidenProvider for %s", url, exc_info=error)
             # Return ParseResult with error message in extracted_text
             return ParseResult(
                  extracted_text=f"Failed to parse content from {url} using BoligsidenProvider: {error}"
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import ClassVar, Optional
 
 from .firecrawl_provider import FirecrawlProvider # Inherit from Firecrawl
 from src.app.lib.url_utils import extract_domain # Import url utils
@@ -7,9 +7,16 @@ from src.app.schemas.parser import ParseResult # Import the new schema
 
 logger = logging.getLogger(__name__)
 
+# Markers identified from the Deno version
+_START_MARKER = "Kun nødvendige formålOK til valgteTilpas"
+_END_MARKER = "## Kontakt os" # Assuming this is a reliable end marker
+
 class DanboligProvider(FirecrawlProvider):
     """Provider implementation for Danbolig.dk, using Firecrawl with specific cleanup."""
 
+    hostnames: ClassVar[tuple[str, ...]] = ("danbolig.dk",)
+    __slots__ = ()
+
     # Override the logger to use the specific class name
     logger = logging.getLogger(__qualname__)
 
@@ -19,6 +26,9 @@ class DanboligProvider(FirecrawlProvider):
 
     def can_handle(self, url: str, html_content: Optional[str] = None) -> bool:
         """Checks if the URL is from danbolig.dk."""
+        # Cheap substring reject before parsing the URL
+        if "danbolig.dk" not in url.lower():
+            return False
         # Also check if the parent (FirecrawlProvider) can handle it (i.e., is configured)
         firecrawl_can_handle = super().can_handle(url, html_content)
         if not firecrawl_can_handle:
@@ -26,7 +36,7 @@ class DanboligProvider(FirecrawlProvider):
 
         try:
             domain = extract_domain(url)
-            return domain == "danbolig.dk"
+            return domain in self.hostnames
         except Exception:
             return False
 
@@ -37,7 +47,7 @@ class DanboligProvider(FirecrawlProvider):
         firecrawl_result: ParseResult = await super().parse_html(url)
 
         if not firecrawl_result.extracted_text or "Failed to scrape content" in firecrawl_result.extracted_text:
-            self.logger.warning(f"Firecrawl failed or returned error for {url}. Returning result as is.")
+            self.logger.warning("Firecrawl failed or returned error for %s. Returning result as is.", url)
             return firecrawl_result
 
         extracted_text = firecrawl_result.extracted_text
@@ -48,11 +58,11 @@ class DanboligProvider(FirecrawlProvider):
             try:
                 cleaned_markdown = self._clean_markdown(extracted_text)
             except Exception as clean_err:
-                 self.logger.error(f"Error cleaning Danbolig markdown for {url}: {clean_err}", exc_info=True)
+                 self.logger.error("Error cleaning Danbolig markdown for %s: %s", url, clean_err, exc_info=True)
                  # Keep the original extracted_text if cleaning fails
                  cleaned_markdown = extracted_text
         else:
-            self.logger.warning(f"No extracted text from Firecrawl to process for {url}")
+            self.logger.warning("No extracted text from Firecrawl to process for %s", url)
             cleaned_markdown = "" # Ensure it's an empty string if None initially
 
         # Return a new ParseResult with the cleaned text and original link from Firecrawl
@@ -65,25 +75,17 @@ class DanboligProvider(FirecrawlProvider):
         """
         Removes common boilerplate/cookie consent text from Danbolig's Firecrawl output.
         """
-        # Markers identified from the Deno version
-        start_marker = "Kun nødvendige formålOK til valgteTilpas"
-        end_marker = "## Kontakt os" # Assuming this is a reliable end marker
-
-        # Find the last occurrence of the start marker, as it might appear multiple times
-        start_index = markdown.rfind(start_marker)
-        # If found, start cleaning after the marker
-        effective_start_index = start_index + len(start_marker) if start_index != -1 else 0
-
-        # Find the last occurrence of the end marker
-        end_index = markdown.rfind(end_marker)
-        # If found, end cleaning before the marker; otherwise, use the end of the string
-        effective_end_index = end_index if end_index != -1 else len(markdown)
-
-        # Ensure start index is not after end index
-        if effective_start_index >= effective_end_index:
+        # Use the last occurrence of each marker, as they might appear multiple times.
+        # Both sit near the end of the output, so the reverse search stops early.
+        start = markdown.rfind(_START_MARKER)
+        start = start + len(_START_MARKER) if start >= 0 else 0
+        end = markdown.rfind(_END_MARKER)
+        end = end if end >= 0 else len(markdown)
+
+        if start >= end:
              self.logger.warning("Danbolig markdown cleaning markers found in unexpected order or overlapping. Returning original markdown.")
              return markdown # Avoid returning empty string if markers are weird
 
-        cleaned = markdown[effective_start_index:effective_end_index].strip()
-        self.logger.debug(f"Cleaned markdown length: {len(cleaned)}")
+        cleaned = markdown[start:end].strip()
+        self.logger.debug("Cleaned markdown length: %d", len(cleaned))
         return cleaned
\ No newline at end of file
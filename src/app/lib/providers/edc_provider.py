@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import ClassVar, Optional
 
 from .json_ld_provider import JsonLdProvider # Import the parent provider
 from src.app.lib.url_utils import extract_domain # Import url utils
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 class EdcProvider(JsonLdProvider):
     """Provider implementation for EDC.dk, primarily using JSON-LD."""
 
+    hostnames: ClassVar[tuple[str, ...]] = ("edc.dk",)
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return "EDC" # Use a more user-friendly name
@@ -18,12 +21,15 @@ class EdcProvider(JsonLdProvider):
         Checks if the URL is from edc.dk AND if the content has JSON-LD
         (checked by the parent class's can_handle method).
         """
+        # Cheap substring reject before parsing the URL
+        if "edc.dk" not in url.lower():
+            return False
         try:
             domain = extract_domain(url)
-            if domain == "edc.dk":
+            if domain in self.hostnames:
                 has_json_ld = super().can_handle(url, html_content)
                 if not has_json_ld:
-                     logger.debug(f"URL is edc.dk but no JSON-LD found: {url}")
+                     logger.debug("URL is edc.dk but no JSON-LD found: %s", url)
                 return has_json_ld
             return False
         except Exception:
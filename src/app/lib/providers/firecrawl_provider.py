@@ -1,24 +1,46 @@
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, Optional
+from typing import Any, List, Optional
 
 from firecrawl import FirecrawlApp # Use the correct import name for the python lib
-from pydantic import HttpUrl
 
 from src.app.core.config import settings
+from src.app.lib.url_utils import to_http_url
 from .base_provider import BaseProvider
 from src.app.schemas.parser import ParseResult # Import the new schema
 
 # Use standard Python logging
 logger = logging.getLogger(__name__) # Renamed logger instance
 
+# Shared by FirecrawlProvider and its subclasses, since they all draw on the same Firecrawl quota
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.FIRECRAWL_MAX_CONCURRENCY)
+    return _semaphore
+
+
+@functools.lru_cache(maxsize=1)
+def _get_firecrawl_app(api_key: Optional[str]) -> FirecrawlApp:
+    """One FirecrawlApp per API key, shared by FirecrawlProvider and its subclasses."""
+    return FirecrawlApp(api_key=api_key)
+
+
 class FirecrawlProvider(BaseProvider):
     """Provider that uses Firecrawl for enhanced web scraping."""
 
+    __slots__ = ('firecrawl',)
+
     # Class level logger
     logger = logging.getLogger(__qualname__) # Use __qualname__ for class-specific logger name
 
     def __init__(self):
-        self.firecrawl = FirecrawlApp(api_key=settings.FIRECRAWL_API_KEY)
+        self.firecrawl = _get_firecrawl_app(settings.FIRECRAWL_API_KEY)
 
     @property
     def name(self) -> str:
@@ -35,37 +57,29 @@ class FirecrawlProvider(BaseProvider):
                 extracted_text="Firecrawl service not configured"
             )
 
-        self.logger.info(f"Scraping URL with Firecrawl: {url}")
+        self.logger.info("Scraping URL with Firecrawl: %s", url)
 
-        image_url: Optional[str] = None
-        response: Optional[Any] = self.firecrawl.scrape_url(
-            url,
-            params={'pageOptions': {'formats': ['markdown']}}
-        )
+        # The Firecrawl SDK is synchronous; run it in a worker thread so the event loop keeps serving other requests
+        async with _get_semaphore():
+            response: Optional[Any] = await asyncio.to_thread(
+                self.firecrawl.scrape_url,
+                url,
+                params={'pageOptions': {'formats': ['markdown']}}
+            )
 
         if not response:
             raise ValueError("No data received from Firecrawl scrape")
 
         extracted_text = response.get('markdown', '') # Get markdown content
-        metadata = response.get('metadata', {})
-
-        if metadata.get('ogImage'):
-            image_url = metadata['ogImage']
-        elif metadata.get('og:image'):
-            image_url = metadata['og:image']
-        elif isinstance(metadata.get('twitter'), dict) and metadata['twitter'].get('image'):
-             image_url = metadata['twitter']['image']
-        elif isinstance(metadata.get('twitter:image'), str):
-             image_url = metadata['twitter:image']
-        else:
-            import re
-            img_match = re.search(r'!\[.*?\]\((https?://[^\)]+)\)', extracted_text)
-            if img_match:
-                image_url = img_match.group(1)
-
-        self.logger.info(f"Extracted image URL via Firecrawl: {image_url or 'No image found'}")
 
         return ParseResult(
-            original_link=HttpUrl(url),  # Firecrawl doesn't provide redirect information
+            original_link=to_http_url(url),  # Firecrawl doesn't provide redirect information
             extracted_text=extracted_text
-        )
\ No newline at end of file
+        )
+
+    async def parse_many(self, urls: List[str]) -> List[ParseResult]:
+        """
+        Scrapes several URLs concurrently, returning results in input order.
+        In-flight scrapes are capped by FIRECRAWL_MAX_CONCURRENCY, shared with parse_html.
+        """
+        return list(await asyncio.gather(*(self.parse_html(url) for url in urls)))
@@ -1,6 +1,10 @@
+import asyncio
 import logging
-from typing import Optional
-from bs4 import BeautifulSoup
+import re
+from html import unescape
+from typing import ClassVar, Optional
+from lxml import etree
+from lxml.html import HtmlElement
 from pydantic import HttpUrl
 
 from .base_provider import BaseProvider
@@ -10,18 +14,41 @@ from src.app.lib.url_utils import extract_domain
 
 logger = logging.getLogger(__name__)
 
+# og:image normally sits in <head>, so a regex over the start of the page finds it without building a DOM
+_OG_IMAGE_SCAN_CHARS = 65536
+_OG_IMAGE_RE = re.compile(
+    r"""<meta\s[^>]*?property\s*=\s*["']og:image["'][^>]*?content\s*=\s*(["'])((?:(?!\1).)+)\1"""
+    r"""|<meta\s[^>]*?content\s*=\s*(["'])((?:(?!\3).)+)\3[^>]*?property\s*=\s*["']og:image["']""",
+    re.IGNORECASE,
+)
+
+# Compiled once at import rather than re-parsed per listing
+_OG_IMAGE_XPATH: etree.XPath = etree.XPath("//meta[@property='og:image']/@content", smart_strings=False)
+# Equivalent of the CSS selector '.property-details-main__header img, .image-gallery-preview img'
+_GALLERY_IMG_SRC_XPATH: etree.XPath = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' property-details-main__header ')]//img/@src"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' image-gallery-preview ')]//img/@src",
+    smart_strings=False,
+)
+
 class HomeProvider(BaseProvider):
     """Provider implementation for Home.dk."""
 
+    hostnames: ClassVar[tuple[str, ...]] = ("home.dk",)
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return "Home.dk"
 
     def can_handle(self, url: str, html_content: Optional[str] = None) -> bool:
         """Checks if the URL is from home.dk."""
+        # Cheap substring reject before parsing the URL
+        if "home.dk" not in url.lower():
+            return False
         try:
             domain = extract_domain(url)
-            return domain == "home.dk"
+            return domain in self.hostnames
         except Exception:
             return False
 
@@ -34,58 +61,56 @@ class HomeProvider(BaseProvider):
             return None
 
         logger.debug("Extracting image URL using HomeProvider logic.")
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # 1. Check meta tags (og:image) - Most reliable
-            og_image = soup.find('meta', property='og:image')
-            if og_image and hasattr(og_image, 'get') and og_image.get('content'):
-                logger.debug("Found image URL in og:image meta tag.")
-                try:
-                    content = og_image.get('content')
-                    if isinstance(content, str):
-                        return content
-                except Exception:
-                    logger.warning(f"og:image URL is not valid.")
-
-            # 2. Look for specific image elements used by Home.dk
-            specific_selectors = '.property-details-main__header img, .image-gallery-preview img'
-            property_images = soup.select(specific_selectors)
-            if property_images:
-                for img in property_images:
-                    if hasattr(img, 'get'):
-                        src = img.get('src')
-                        if isinstance(src, str) and src.startswith('http'):
-                            logger.debug(f"Found image URL in specific selector: {specific_selectors}")
-                            return src
-
-            # 3. Fall back to generic image extraction
-            logger.debug("No specific image found, falling back to generic extraction.")
-            # Pass the HTML content and base URL to extract_first_image_url
-            image_url = await html_utils.extract_first_image_url(html_content=html_content, base_url="https://home.dk")
-            if image_url:
-                return image_url
-
-            logger.debug("No suitable image URL found by HomeProvider.")
-            return None
+        og_match = _OG_IMAGE_RE.search(html_content, 0, _OG_IMAGE_SCAN_CHARS)
+        if og_match:
+            logger.debug("Found image URL in og:image meta tag.")
+            return unescape(og_match.group(2) or og_match.group(4))
 
+        try:
+            # Parsing is CPU-bound; lxml releases the GIL, so a worker thread keeps the event loop free
+            tree = await asyncio.to_thread(html_utils.parse_html_tree, html_content)
+            return await self._extract_image_url(tree)
         except Exception as error:
             logger.error("Failed to extract image URL in HomeProvider", exc_info=error)
             return None
 
+    async def _extract_image_url(self, tree: HtmlElement) -> Optional[str]:
+        """Image lookup on an already parsed tree, so callers holding one don't parse again."""
+        # 1. Check meta tags (og:image) - Most reliable
+        og_image = _OG_IMAGE_XPATH(tree)
+        if og_image and og_image[0]:
+            logger.debug("Found image URL in og:image meta tag.")
+            return og_image[0]
+
+        # 2. Look for specific image elements used by Home.dk
+        for src in _GALLERY_IMG_SRC_XPATH(tree):
+            if src.startswith('http'):
+                logger.debug("Found image URL in Home.dk gallery selector.")
+                return src
+
+        # 3. Fall back to generic image extraction
+        logger.debug("No specific image found, falling back to generic extraction.")
+        image_url = await html_utils.extract_first_image_url(html_content=tree, base_url="https://home.dk")
+        if image_url:
+            return image_url
+
+        logger.debug("No suitable image URL found by HomeProvider.")
+        return None
+
     async def parse_html(self, url: str, html_content: str) -> ParseResult:
         """
         Parses Home.dk HTML and extracts text using generic utils.
         """
-        logger.info(f"Parsing HTML with HomeProvider for URL: {url}")
+        logger.info("Parsing HTML with HomeProvider for URL: %s", url)
         try:
-            extracted_text = await html_utils.extract_text_from_html(html_content)
+            tree = await asyncio.to_thread(html_utils.parse_html_tree, html_content) if html_content else None
+            extracted_text = await html_utils.extract_text_from_html(tree)
             validated_original_link: Optional[HttpUrl] = None
 
             try:
                 validated_original_link = HttpUrl(url)
             except Exception:
-                logger.warning(f"Input URL '{url}' is not a valid HttpUrl for ParseResult.")
+                logger.warning("Input URL '%s' is not a valid HttpUrl for ParseResult.", url)
 
             return ParseResult(
                 original_link=validated_original_link,
@@ -93,7 +118,7 @@ class HomeProvider(BaseProvider):
             )
 
         except Exception as error:
-            logger.error(f"Failed to parse HTML with HomeProvider for {url}", exc_info=error)
+            logger.error("Failed to parse HTML with HomeProvider for %s", url, exc_info=error)
             return ParseResult(
                 original_link=None,
                 extracted_text=f"Failed to parse content from {url} using HomeProvider: {error}"
@@ -1,7 +1,12 @@
-import logging
+import asyncio
 import json
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from lxml import etree
+from lxml.html import HtmlElement
 
 from pydantic import HttpUrl # Import HttpUrl for validation
 
@@ -11,24 +16,69 @@ from src.app.lib import html_utils # Import the new html_utils
 
 logger = logging.getLogger(__name__)
 
+# Listing pages are untrusted input; oversized JSON-LD is skipped rather than decoded
+MAX_JSON_LD_SCRIPT_CHARS = 512_000
+MAX_JSON_LD_TOTAL_CHARS = 2_000_000
+
+# Schema.org properties whose value is an image: a URL string, an ImageObject or a list of either
+_IMAGE_KEYS = frozenset({'image', 'primaryImageOfPage', 'thumbnailUrl'})
+# Properties holding the URL inside an ImageObject
+_IMAGE_OBJECT_URL_KEYS = frozenset({'url', 'contentUrl'})
+
+# Compiled once at import rather than re-parsed per listing
+_JSON_LD_SCRIPTS_XPATH: etree.XPath = etree.XPath("//script[@type='application/ld+json']")
+
+
+def _decode_json_ld(raw: str) -> Any:
+    """
+    Decodes with orjson, falling back to json for what only the stdlib accepts (NaN, Infinity,
+    numbers beyond float range). orjson reads integers wider than 64 bits as floats; such values
+    don't occur in listing data, so that difference is accepted.
+    """
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
+def _iter_images(root: Any) -> Iterator[str]:
+    """
+    Yields image URL candidates from decoded JSON-LD, breadth first so that a listing's own
+    image wins over ones nested in offers, @graph members and the like.
+    """
+    queue: Deque[Tuple[Any, bool]] = deque([(root, False)])
+    while queue:
+        node, in_image = queue.popleft()
+        if isinstance(node, str):
+            if in_image:
+                yield node
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key in _IMAGE_KEYS or (in_image and key in _IMAGE_OBJECT_URL_KEYS):
+                    queue.append((value, True))
+                elif isinstance(value, (dict, list)):
+                    queue.append((value, False))
+        elif isinstance(node, list):
+            queue.extend((child, in_image) for child in node)
+
+
 class JsonLdProvider(BaseProvider):
     """Provider that extracts data from JSON-LD scripts within HTML."""
 
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return "JSON-LD Provider"
 
     def can_handle(self, url: str, html_content: Optional[str] = None) -> bool:
-        """Checks if the HTML content contains JSON-LD script tags."""
+        """
+        Checks if the HTML content contains JSON-LD script tags.
+        A substring scan is enough to pick the provider; the document is only parsed in parse_html.
+        """
         if not html_content:
             return False
-        try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            return len(json_ld_scripts) > 0
-        except Exception as error:
-            logger.error("Error checking for JSON-LD scripts", exc_info=error)
-            return False
+        return 'application/ld+json' in html_content
 
     async def extract_image_url(self, html_content: str) -> Optional[str]:
         """
@@ -38,87 +88,85 @@ class JsonLdProvider(BaseProvider):
             return None
 
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-
-            # 1. Check JSON-LD scripts
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
-                try:
-                    if isinstance(script, Tag) and script.string:
-                        data = json.loads(script.string)
-                        items = data if isinstance(data, list) else [data]
-                        for item in items:
-                            # Look for common image properties in JSON-LD schemas
-                            if isinstance(item, dict):
-                                image = item.get('image')
-                                if isinstance(image, str) and image.startswith('http'):
-                                    logger.debug("Found image URL in JSON-LD 'image' property.")
-                                    return image
-                                if isinstance(image, list) and len(image) > 0 and isinstance(image[0], str) and image[0].startswith('http'):
-                                     logger.debug("Found image URL in JSON-LD 'image' list.")
-                                     return image[0]
-                                # Check nested structures common in Product/Offer schemas
-                                offers = item.get('offers')
-                                if isinstance(offers, dict) and isinstance(offers.get('itemOffered'), dict):
-                                    nested_image = offers['itemOffered'].get('image')
-                                    if isinstance(nested_image, str) and nested_image.startswith('http'):
-                                        logger.debug("Found image URL in nested JSON-LD 'offers.itemOffered.image'.")
-                                        return nested_image
-                except json.JSONDecodeError:
-                    logger.warning("Failed to parse JSON-LD content in script tag.")
-                except Exception as e:
-                     logger.error(f"Error processing JSON-LD script content: {e}", exc_info=True)
-
-
-            # 2. Fallback to meta tags (using html_utils)
-            logger.debug("No suitable image in JSON-LD, checking meta tags and generic extraction.")
-            # Pass empty string as base_url if we don't have one
-            meta_image = await html_utils.extract_first_image_url(html_content, base_url="")
-            if meta_image:
-                return meta_image
-
-            return None # No image found
-
+            tree, json_ld_items = await asyncio.to_thread(self._parse_document, html_content)
+            return await self._extract_image_url(tree, json_ld_items)
         except Exception as error:
             logger.error("Failed to extract image URL in JsonLdProvider", exc_info=error)
             return None
 
+    async def _extract_image_url(self, tree: HtmlElement, json_ld_items: List[Any]) -> Optional[str]:
+        """Image lookup on an already parsed tree and its decoded JSON-LD items."""
+        # 1. Check JSON-LD items
+        image = self._image_from_json_ld(json_ld_items)
+        if image:
+            return image
+
+        # 2. Fallback to meta tags (using html_utils)
+        logger.debug("No suitable image in JSON-LD, checking meta tags and generic extraction.")
+        # Pass empty string as base_url if we don't have one
+        return await html_utils.extract_first_image_url(tree, base_url="")
+
+    @classmethod
+    def _parse_document(cls, html_content: str) -> Tuple[HtmlElement, List[Any]]:
+        tree = html_utils.parse_html_tree(html_content)
+        return tree, cls._load_json_ld(tree)
+
+    @staticmethod
+    def _load_json_ld(tree: HtmlElement) -> List[Any]:
+        """Decodes every JSON-LD script in the tree into one flat list of items, within the size caps above."""
+        items: List[Any] = []
+        total_chars = 0
+        for script in _JSON_LD_SCRIPTS_XPATH(tree):
+            raw = script.text
+            if not raw:
+                continue
+            if len(raw) > MAX_JSON_LD_SCRIPT_CHARS:
+                logger.warning("Skipping JSON-LD script of %d chars (limit %d).", len(raw), MAX_JSON_LD_SCRIPT_CHARS)
+                continue
+            total_chars += len(raw)
+            if total_chars > MAX_JSON_LD_TOTAL_CHARS:
+                logger.warning("JSON-LD on page exceeds %d chars; ignoring remaining scripts.", MAX_JSON_LD_TOTAL_CHARS)
+                break
+            try:
+                data = _decode_json_ld(raw)
+                # Add to list whether it's a single object or a list itself
+                if isinstance(data, list):
+                    items.extend(data)
+                else:
+                    items.append(data)
+            except json.JSONDecodeError:
+                logger.warning("Failed to parse JSON-LD content in script tag.")
+            except Exception as error:
+                logger.error("Error processing JSON-LD script content: %s", error, exc_info=error)
+        return items
+
+    @staticmethod
+    def _image_from_json_ld(items: List[Any]) -> Optional[str]:
+        for image in _iter_images(items):
+            if image.startswith('http'):
+                logger.debug("Found image URL in JSON-LD.")
+                return image
+        return None
+
     async def parse_html(self, url: str, html_content: str) -> ParseResult:
         """
         Parses HTML, extracts JSON-LD, combines it with general text content.
         """
-        logger.info(f"Parsing HTML with JsonLdProvider for URL: {url}")
+        logger.info("Parsing HTML with JsonLdProvider for URL: %s", url)
         extracted_json_ld_list: List[Dict[str, Any]] = []
-        property_image_url: Optional[str] = None
         extracted_text: str = ""
 
         try:
-            # Extract image URL first (uses JSON-LD priority)
-            property_image_url = await self.extract_image_url(html_content)
+            # Parse once; the tree and the decoded JSON-LD are shared by text and JSON-LD extraction.
+            # Both steps are CPU-bound, so they run in a worker thread to keep the event loop free.
+            tree, extracted_json_ld_list = await asyncio.to_thread(self._parse_document, html_content)
 
             # Extract general text content
-            extracted_text = await html_utils.extract_text_from_html(html_content)
-
-            # Extract and combine all JSON-LD data
-            soup = BeautifulSoup(html_content, 'lxml')
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
-                 try:
-                     if isinstance(script, Tag) and script.string:
-                         data = json.loads(script.string)
-                         # Add to list whether it's a single object or a list itself
-                         if isinstance(data, list):
-                             extracted_json_ld_list.extend(data)
-                         else:
-                             extracted_json_ld_list.append(data)
-                 except json.JSONDecodeError:
-                     logger.warning("Failed to parse JSON-LD content in script tag during main parse.")
-                 except Exception as e:
-                     logger.error(f"Error processing JSON-LD script content during main parse: {e}", exc_info=True)
+            extracted_text = await html_utils.extract_text_from_html(tree)
 
             # Combine JSON-LD with extracted text for AI analysis context
             # Convert JSON-LD list to a string representation
-            json_ld_string = json.dumps(extracted_json_ld_list, indent=2, ensure_ascii=False)
+            json_ld_string = orjson.dumps(extracted_json_ld_list, option=orjson.OPT_INDENT_2).decode()
             combined_text = f"JSON-LD Data:\n{json_ld_string}\n\nExtracted Page Text:\n{extracted_text}"
 
             # Validate URL before assigning
@@ -126,17 +174,16 @@ class JsonLdProvider(BaseProvider):
             try:
                 validated_url = HttpUrl(url)
             except Exception:
-                 logger.warning(f"Input URL '{url}' is not a valid HttpUrl for ParseResult.")
+                 logger.warning("Input URL '%s' is not a valid HttpUrl for ParseResult.", url)
 
 
             return ParseResult(
                 original_link=validated_url, # JSON-LD sites are usually the direct source
                 extracted_text=combined_text
-                # property_image_url and json_ld_data are not part of ParseResult schema
             )
 
         except Exception as error:
-            logger.error(f"Failed to parse HTML with JsonLdProvider for {url}", exc_info=error)
+            logger.error("Failed to parse HTML with JsonLdProvider for %s", url, exc_info=error)
             # Return empty ParseResult on failure
             return ParseResult(
                  extracted_text=f"Failed to parse content from {url} using JsonLdProvider: {error}"
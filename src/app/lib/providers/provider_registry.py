@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 # Import all implemented provider classes
 from .base_provider import BaseProvider
@@ -9,27 +9,32 @@ from .danbolig_provider import DanboligProvider
 from .edc_provider import EdcProvider
 from .firecrawl_provider import FirecrawlProvider
 from .json_ld_provider import JsonLdProvider
+from src.app.lib.url_utils import extract_domain
 
 
 logger = logging.getLogger(__name__)
 
 class ProviderRegistry:
     """
-    Singleton registry for managing and selecting real estate listing providers.
+    Registry for managing and selecting real estate listing providers.
+    One instance is built at import and shared through get_provider_registry().
     """
-    _instance: Optional['ProviderRegistry'] = None
-    providers: List[BaseProvider] = []
+    __slots__ = ('providers', '_providers_by_host', '_generic_providers')
 
-    def __new__(cls):
-        if cls._instance is None:
-            logger.info("Creating ProviderRegistry instance.")
-            cls._instance = super(ProviderRegistry, cls).__new__(cls)
-            cls._instance._initialize_providers()
-        return cls._instance
+    providers: List[BaseProvider]
+    # Host-bound providers keyed by hostname, and the generic providers (in priority order)
+    # that are tried through can_handle when no host-bound provider accepts the URL.
+    _providers_by_host: Dict[str, BaseProvider]
+    _generic_providers: List[BaseProvider]
+
+    def __init__(self):
+        self._initialize_providers()
 
     def _initialize_providers(self):
         """Registers all available providers in a specific order of priority."""
         self.providers = [] # Ensure list is empty before initializing
+        self._providers_by_host = {}
+        self._generic_providers = []
 
         logger.info("Initializing and registering providers...")
 
@@ -50,7 +55,7 @@ class ProviderRegistry:
         # 3. Fallback (if needed - currently commented out in Deno version)
         # self.register_provider(FallbackProvider())
 
-        logger.info(f"Registered {len(self.providers)} providers.")
+        logger.info("Registered %d providers.", len(self.providers))
 
     def register_provider(self, provider: BaseProvider):
         """Adds a provider instance to the registry."""
@@ -59,7 +64,13 @@ class ProviderRegistry:
         # For Firecrawl, we check if self.firecrawl is None in its can_handle.
         # For others, assume they are always available unless they raise errors.
         self.providers.append(provider)
-        logger.debug(f"Registered provider: {provider.name}")
+        if provider.hostnames:
+            for hostname in provider.hostnames:
+                # setdefault keeps the first (highest priority) provider for a host
+                self._providers_by_host.setdefault(hostname, provider)
+        else:
+            self._generic_providers.append(provider)
+        logger.debug("Registered provider: %s", provider.name)
 
     def get_provider_for_content(self, url: str, html_content: Optional[str] = None) -> BaseProvider:
         """
@@ -77,19 +88,35 @@ class ProviderRegistry:
             ValueError: If no suitable provider is found.
             :rtype: object
         """
-        logger.debug(f"Attempting to find provider for URL: {url}")
-        for provider in self.providers:
-            try:
-                if provider.can_handle(url, html_content):
-                    logger.info(f"Using provider '{provider.name}' for URL: {url}")
-                    return provider
-            except Exception as e:
-                 logger.error(f"Error checking provider {provider.name} for URL {url}", exc_info=e)
-                 # Continue to the next provider
-
-        logger.error(f"No suitable provider found for URL: {url}")
+        logger.debug("Attempting to find provider for URL: %s", url)
+
+        # Host-bound providers are found with a single dict lookup. They still get the
+        # final say through can_handle (e.g. EDC also requires JSON-LD content).
+        domain = extract_domain(url)
+        host_provider = self._providers_by_host.get(domain) if domain else None
+        if host_provider is not None and self._provider_can_handle(host_provider, url, html_content):
+            return host_provider
+
+        for provider in self._generic_providers:
+            if self._provider_can_handle(provider, url, html_content):
+                return provider
+
+        logger.error("No suitable provider found for URL: %s", url)
         raise ValueError(f"Unsupported URL or content: No provider could handle {url}")
 
-# Function to easily get the singleton instance
+    @staticmethod
+    def _provider_can_handle(provider: BaseProvider, url: str, html_content: Optional[str]) -> bool:
+        try:
+            if provider.can_handle(url, html_content):
+                logger.info("Using provider '%s' for URL: %s", provider.name, url)
+                return True
+        except Exception as e:
+            logger.error("Error checking provider %s for URL %s", provider.name, url, exc_info=e)
+        return False
+
+_registry: ProviderRegistry = ProviderRegistry()
+
+
+# Function to easily get the shared instance
 def get_provider_registry() -> ProviderRegistry:
-    return ProviderRegistry()
\ No newline at end of file
+    return _registry
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 
@@ -7,29 +8,35 @@ from src.app.core.config import settings
 logger = logging.getLogger(__name__)
 
 _supabase_admin_client: Optional[AsyncClient] = None
+_admin_client_lock = asyncio.Lock()
 
 
 async def get_supabase_admin_client() -> AsyncClient:
     global _supabase_admin_client
 
-    if _supabase_admin_client is None:
-        logger.info("Initializing Supabase Admin Client...")
-        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
-            logger.error("Supabase URL or Service Role Key is missing!")
-            raise ValueError("Supabase credentials missing for admin client.")
-
-        try:
-            _supabase_admin_client = await acreate_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_ROLE_KEY,
-                options=AsyncClientOptions(
-                    postgrest_client_timeout=5,  # Increased timeout for potentially slower DB ops
+    if _supabase_admin_client is not None:
+        return _supabase_admin_client
+
+    # Concurrent first callers wait here so the client is only created once
+    async with _admin_client_lock:
+        if _supabase_admin_client is None:
+            logger.info("Initializing Supabase Admin Client...")
+            if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
+                logger.error("Supabase URL or Service Role Key is missing!")
+                raise ValueError("Supabase credentials missing for admin client.")
+
+            try:
+                _supabase_admin_client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_SERVICE_ROLE_KEY,
+                    options=AsyncClientOptions(
+                        postgrest_client_timeout=5,  # Increased timeout for potentially slower DB ops
+                    )
                 )
-            )
-            logger.info("Supabase Admin Client Initialized.")
+                logger.info("Supabase Admin Client Initialized.")
 
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase Admin Client: {e}", exc_info=True)
-            raise
+            except Exception as e:
+                logger.error(f"Failed to initialize Supabase Admin Client: {e}", exc_info=True)
+                raise
 
     return _supabase_admin_client
@@ -1,13 +1,101 @@
+import ipaddress
 import logging
-from urllib.parse import urlparse, urlunparse, urljoin
+import re
+from functools import lru_cache
+from urllib.parse import urljoin, uses_params
+
+from pydantic import HttpUrl
 
 logger = logging.getLogger(__name__)
 
-from typing import Optional
+from typing import Optional, Tuple
+
+# Characters allowed in a URL scheme after the first letter (RFC 3986)
+_SCHEME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.')
+# Leading characters urlsplit strips, and characters it removes anywhere in the URL
+_LEADING_JUNK = ''.join(map(chr, range(0x21)))
+_UNSAFE_CHARS = ('\t', '\r', '\n')
+_IPV_FUTURE_RE = re.compile(r'\Av[a-fA-F0-9]+\..+\Z')
+
+
+def _split_url(url: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Splits a URL into (scheme, netloc, path) with plain string operations.
+    Matches urlparse for the parts this module uses (the path excludes ;params, ?query and #fragment).
+    The scheme is '' for scheme-relative URLs; returns None when there is no netloc.
+    """
+    for char in _UNSAFE_CHARS:
+        if char in url:
+            url = url.replace(char, '')
+    url = url.lstrip(_LEADING_JUNK)
+
+    if url.startswith('//'):
+        # Scheme-relative: a netloc but no scheme
+        scheme, rest = '', url[2:]
+    else:
+        scheme_end = url.find('://')
+        if scheme_end <= 0:
+            return None
+        scheme = url[:scheme_end]
+        if not scheme[0].isascii() or not scheme[0].isalpha() or not _SCHEME_CHARS.issuperset(scheme):
+            return None
+        rest = url[scheme_end + 3:]
+
+    netloc_end = len(rest)
+    for delimiter in '/?#':
+        index = rest.find(delimiter)
+        if 0 <= index < netloc_end:
+            netloc_end = index
+    netloc = rest[:netloc_end]
+    if not netloc:
+        return None
+    if '[' in netloc or ']' in netloc:
+        # urlparse raises on unbalanced or invalid bracketed hosts; mirror that as "no URL"
+        if ('[' in netloc) != (']' in netloc):
+            return None
+        if not _is_valid_bracketed_host(netloc.partition('[')[2].partition(']')[0]):
+            return None
+
+    path = rest[netloc_end:]
+    for delimiter in '?#':
+        index = path.find(delimiter)
+        if index >= 0:
+            path = path[:index]
+    scheme = scheme.lower()
+    # Like urlparse, ;params are only split off the last path segment, and only for schemes that use them
+    if scheme in uses_params:
+        params_start = path.find(';', path.rfind('/'))
+        if params_start >= 0:
+            path = path[:params_start]
+
+    return scheme, netloc, path
+
+
+def _is_valid_bracketed_host(host: str) -> bool:
+    """Same check urlsplit applies to a [bracketed] host: an IPvFuture literal or an IPv6 address."""
+    if host.startswith('v'):
+        return _IPV_FUTURE_RE.match(host) is not None
+    try:
+        return isinstance(ipaddress.ip_address(host), ipaddress.IPv6Address)
+    except ValueError:
+        return False
+
 
+def _hostname_from_netloc(netloc: str) -> Optional[str]:
+    """Drops userinfo and port from a netloc, returning the lowercased host (IPv6 without brackets)."""
+    host_info = netloc.rpartition('@')[2]
+    _, has_bracket, bracketed = host_info.partition('[')
+    if has_bracket:
+        host = bracketed.partition(']')[0]
+    else:
+        host = host_info.partition(':')[0]
+    return host.lower() or None
+
+@lru_cache(maxsize=2048)
 def normalize_url(url: Optional[str]) -> Optional[str]:
     """
     Normalizes a URL by removing query parameters, fragments, and trailing slashes from the path.
+    Cached, since the same URL is normalized for validation, lookup and storage.
 
     Args:
         url: The original URL string.
@@ -19,26 +107,24 @@ def normalize_url(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
     try:
-        parsed = urlparse(url)
+        parts = _split_url(url)
 
-        if not parsed.scheme or not parsed.netloc:
+        if parts is None or not parts[0]:
             return None # Treat as invalid if scheme or netloc is missing
 
-        scheme = parsed.scheme.lower()
-        netloc = parsed.netloc.lower()
-        path = parsed.path
-
-        path = path.lower()
+        scheme, netloc, path = parts
 
-        return urlunparse((scheme, netloc, path, '', '', ''))
+        return f"{scheme}://{netloc.lower()}{path.lower()}"
 
     except Exception as e:
         logger.warning(f"Error normalizing URL '{url}': {e}. Returning None.")
         return None
 
+@lru_cache(maxsize=8192)
 def extract_domain(url: Optional[str], remove_www: bool = True) -> Optional[str]:
     """
     Extracts the domain name (hostname) from a URL.
+    Cached, since dispatch and several providers look up the same URL in turn.
 
     Args:
         url: The URL string.
@@ -50,15 +136,13 @@ def extract_domain(url: Optional[str], remove_www: bool = True) -> Optional[str]
     if not url:
         return None
     try:
-        parsed = urlparse(url)
-        hostname = parsed.hostname
+        parts = _split_url(url)
+        hostname = _hostname_from_netloc(parts[1]) if parts else None
 
         if not hostname: # Handle cases like 'http://' or invalid URLs
              logger.debug(f"No hostname found for URL '{url}'.")
              return None
 
-        hostname = hostname.lower() # Normalize to lowercase
-
         return hostname
     except Exception as e:
         logger.warning(f"Error extracting domain from URL '{url}': {e}. Returning None.")
@@ -77,8 +161,8 @@ def is_absolute_url(url: str) -> bool:
     if not url:
         return False
     try:
-        parsed = urlparse(url)
-        return bool(parsed.scheme and parsed.netloc)
+        parts = _split_url(url)
+        return parts is not None and bool(parts[0])
     except Exception:
         return False
 
@@ -107,9 +191,8 @@ def resolve_url(base_url: Optional[str], relative_url: Optional[str]) -> Optiona
         # Let urljoin handle the path logic directly
         resolved = urljoin(base_url, relative_url)
 
-        # Check if the result is a valid, absolute URL
-        parsed_resolved = urlparse(resolved)
-        if parsed_resolved.scheme and parsed_resolved.netloc:
+        # Check if the result is a valid, absolute URL (string split, no second urlparse)
+        if is_absolute_url(resolved):
             return resolved
         else:
             # Handle cases where urljoin might produce unexpected results with odd inputs
@@ -118,4 +201,21 @@ def resolve_url(base_url: Optional[str], relative_url: Optional[str]) -> Optiona
             return None
     except Exception as e:
         logger.warning(f"Error resolving URL '{relative_url}' against base '{base_url}': {e}. Returning None.")
-        return None
\ No newline at end of file
+        return None
+
+@lru_cache(maxsize=2048)
+def to_http_url(url: str) -> Optional[HttpUrl]:
+    """
+    Validates a URL string as a pydantic HttpUrl.
+    Results are cached, since the same listing and source URLs are validated repeatedly.
+
+    Args:
+        url: The URL string to validate.
+
+    Returns:
+        The validated HttpUrl, or None if the URL is not a valid http(s) URL.
+    """
+    try:
+        return HttpUrl(url)
+    except Exception:
+        return None
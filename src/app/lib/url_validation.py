@@ -1,11 +1,12 @@
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
-# List of supported real estate domains
-SUPPORTED_DOMAINS = [
+# Supported real estate domains; a frozenset so the per-request membership test is a hash lookup
+SUPPORTED_DOMAINS: frozenset[str] = frozenset({
     # Major aggregators
     'boligsiden.dk',
     
@@ -28,11 +29,32 @@ SUPPORTED_DOMAINS = [
     'dinmaegler.dk',
     'lilholts.dk',
     'coldwellbanker.dk'
-]
+})
 
+class ValidationResult(NamedTuple):
+    """Outcome of validating a listing URL; error is the user-facing message when invalid."""
+    valid: bool
+    error: Optional[str] = None
+
+
+# Results are immutable, so every validation returns one of these shared instances
+_VALID = ValidationResult(True)
+_ERR_MISSING = ValidationResult(False, "Link er ikke angivet")
+_ERR_NOT_FOR_SALE = ValidationResult(False, "Linket ser ud til at være en bolig der ikke er til salg.")
+_ERR_UNSUPPORTED = ValidationResult(
+    False,
+    "Linket skal være fra en understøttet boligportal. Se listen over understøttede portaler på forsiden."
+)
+_ERR_NOT_BOLIGSIDEN = ValidationResult(False, "Linket skal være fra boligsiden.dk")
+_ERR_MISSING_UDBUD = ValidationResult(False, "Linket skal indeholde en udbuds-ID (udbud=...)")
+_ERR_INVALID = ValidationResult(False, "Linket er ugyldigt")
+
+
+@lru_cache(maxsize=2048)
 def extract_domain(url: str) -> str:
     """
     Extract the domain from a URL.
+    Cached, as both validators look up the domain of the same URL.
     
     Args:
         url: The URL to extract the domain from
@@ -49,7 +71,14 @@ def extract_domain(url: str) -> str:
         
     return domain
 
-def validate_listing_url(url: str) -> Dict[str, Any]:
+# Validation is a pure function of the URL, so repeated (often rejected) URLs from
+# retries and bots are answered from a bounded cache of the shared results above.
+VALIDATION_CACHE_SIZE = 10_000
+# Longer inputs are rejected before parsing (and before they can occupy the cache)
+MAX_URL_LENGTH = 2048
+
+
+def validate_listing_url(url: str) -> ValidationResult:
     """
     Validates that a URL is from a supported real estate provider.
     
@@ -57,12 +86,21 @@ def validate_listing_url(url: str) -> Dict[str, Any]:
         url: URL to validate
         
     Returns:
-        Dictionary with validation result and error message if invalid
+        ValidationResult with the error message set if invalid
     """
     # Check if URL is provided
     if not url:
-        return {"valid": False, "error": "Link er ikke angivet"}
-    
+        return _ERR_MISSING
+
+    # Cheap rejection of oversized or non-http(s) input, without parsing
+    if len(url) > MAX_URL_LENGTH or not url[:8].lower().startswith(('http://', 'https://')):
+        return _ERR_INVALID
+
+    return _validate_listing_url(url)
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_listing_url(url: str) -> ValidationResult:
+    """Cached part of validate_listing_url, for URLs that passed the cheap checks."""
     try:
         # Parse URL to check structure
         parsed_url = urlparse(url)
@@ -70,10 +108,7 @@ def validate_listing_url(url: str) -> Dict[str, Any]:
         
         # Check for ViewPage in the URL path
         if 'viewpage' in parsed_url.path.lower():
-            return {
-                "valid": False,
-                "error": "Linket ser ud til at være en bolig der ikke er til salg."
-            }
+            return _ERR_NOT_FOR_SALE
         
         # Special case: For Boligsiden URLs, use the more strict validation
         if domain == 'boligsiden.dk':
@@ -81,20 +116,15 @@ def validate_listing_url(url: str) -> Dict[str, Any]:
         
         # For all other domains, just check if the domain is supported
         if domain not in SUPPORTED_DOMAINS:
-            return {
-                "valid": False,
-                "error": "Linket skal være fra en understøttet boligportal. Se listen over understøttede portaler på forsiden."
-            }
+            return _ERR_UNSUPPORTED
         
-        return {"valid": True}
+        return _VALID
     except Exception as e:
         logger.error(f"Error validating URL {url}: {e}")
-        return {
-            "valid": False,
-            "error": "Linket er ugyldigt"
-        }
+        return _ERR_INVALID
 
-def validate_boligsiden_url(url: str) -> Dict[str, Any]:
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def validate_boligsiden_url(url: str) -> ValidationResult:
     """
     Legacy function to validate Boligsiden URLs for backward compatibility.
     
@@ -102,11 +132,11 @@ def validate_boligsiden_url(url: str) -> Dict[str, Any]:
         url: URL to validate
         
     Returns:
-        Dictionary with validation result and error message if invalid
+        ValidationResult with the error message set if invalid
     """
     # Check if URL is provided
     if not url:
-        return {"valid": False, "error": "Link er ikke angivet"}
+        return _ERR_MISSING
     
     try:
         # Parse URL to check structure
@@ -115,29 +145,17 @@ def validate_boligsiden_url(url: str) -> Dict[str, Any]:
         
         # Check hostname (allow both www and non-www versions)
         if domain != 'boligsiden.dk':
-            return {
-                "valid": False,
-                "error": "Linket skal være fra boligsiden.dk"
-            }
+            return _ERR_NOT_BOLIGSIDEN
         
         # Check for udbud parameter
-        query_params = dict(param.split('=') for param in parsed_url.query.split('&') if '=' in param)
-        if 'udbud' not in query_params:
-            return {
-                "valid": False,
-                "error": "Linket skal indeholde en udbuds-ID (udbud=...)"
-            }
+        # Substring scan for an udbud= parameter; the leading '&' anchors it to a parameter name
+        if '&udbud=' not in '&' + parsed_url.query:
+            return _ERR_MISSING_UDBUD
         
         if 'viewpage' in parsed_url.path.lower():
-            return {
-                "valid": False,
-                "error": "Linket ser ud til at være en bolig der ikke er til salg."
-            }
+            return _ERR_NOT_FOR_SALE
         
-        return {"valid": True}
+        return _VALID
     except Exception as e:
         logger.error(f"Error validating Boligsiden URL {url}: {e}")
-        return {
-            "valid": False,
-            "error": "Linket er ugyldigt"
-        } 
\ No newline at end of file
+        return _ERR_INVALID 
\ No newline at end of file
@@ -1,22 +1,71 @@
 import logging
+import queue
 import time
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 import uvicorn  # Import uvicorn for local running checks
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from src.app.core.config import settings
+from src.app.lib.html_utils import close_http_client
+from src.app.lib.providers.boligsiden_provider import close_client as close_boligsiden_client
 from src.app.lib.supabase_client import get_supabase_admin_client
 from src.app.routers import analyze
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] [%(name)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+def _configure_logging() -> None:
+    """
+    Records are handed to a queue on the event loop and written to stderr by a listener
+    thread, so request handlers never block on the stream lock or console I/O.
+    Runs once per process: `python -m src.app.main` imports this module a second time.
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root_logger.handlers):
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s [%(levelname)s] [%(name)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Layout is applied once, by stream_handler
+    # Kept on the handler (as Python 3.12's QueueHandler does) so shutdown finds it from either import
+    queue_handler.listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[queue_handler]
+    )
+    _start_log_listener()
+
+
+def _start_log_listener() -> None:
+    """
+    Starts the listener thread unless it is already running. Lifespan startup calls this too,
+    so records are written again after an earlier shutdown stopped it (e.g. a second TestClient).
+    """
+    for handler in logging.getLogger().handlers:
+        listener = getattr(handler, "listener", None)
+        if isinstance(handler, QueueHandler) and listener is not None and not getattr(handler, "listener_running", False):
+            listener.start()
+            handler.listener_running = True  # type: ignore[attr-defined]
+
+
+def _stop_log_listener() -> None:
+    """Flushes queued records and stops the listener thread; _start_log_listener restarts it."""
+    for handler in logging.getLogger().handlers:
+        listener = getattr(handler, "listener", None)
+        if isinstance(handler, QueueHandler) and listener is not None and getattr(handler, "listener_running", False):
+            listener.stop()
+            handler.listener_running = False  # type: ignore[attr-defined]
+
+
+_configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +82,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.ENVIRONMENT != "production" else None,
     docs_url=f"{settings.API_V1_STR}/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url=f"{settings.API_V1_STR}/redoc" if settings.ENVIRONMENT != "production" else None,
+    default_response_class=ORJSONResponse,  # orjson serializes the analysis payloads much faster than json
 )
 
 app.add_middleware(
@@ -45,24 +95,31 @@ app.add_middleware(
 
 
 # Request Logging / Timing
+_perf_counter = time.perf_counter
+# The X-Process-Time header is a debugging aid; production responses skip it
+_SEND_PROCESS_TIME_HEADER = settings.ENVIRONMENT != "production"
+
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
+    start_time = _perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = f"{process_time:.4f}"  # Use f-string
-
-    log_details = {
-        "method": request.method,
-        "path": request.url.path,
-        "query_params": str(request.query_params),
-        "client_host": request.client.host if request.client else "unknown",
-        "status_code": response.status_code,
-        "process_time_ms": round(process_time * 1000, 2)
-    }
-
-    # Use structured logging if available, otherwise format nicely
-    logger.info(f"Request processed: {log_details}")
+    process_time = _perf_counter() - start_time
+    if _SEND_PROCESS_TIME_HEADER:
+        response.headers["X-Process-Time"] = format(process_time, ".4f")
+
+    # Lazy %-formatting, and the arguments (request.url, query_params) are only built when INFO is enabled
+    if logger.isEnabledFor(logging.INFO):
+        client = request.client  # A property that builds a new Address on each access
+        logger.info(
+            "Request processed: method=%s path=%s query_params=%s client_host=%s status_code=%d process_time_ms=%.2f",
+            request.method,
+            request.url.path,
+            request.query_params,
+            client.host if client else "unknown",
+            response.status_code,
+            process_time * 1000,
+        )
     return response
 
 
@@ -71,7 +128,7 @@ async def add_process_time_header(request: Request, call_next):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     # Log the detailed validation errors
     logger.warning(f"Validation error for {request.method} {request.url.path}: {exc.errors()}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         # Return a user-friendly message and optionally the detailed errors
         content={"detail": "Validation Error", "errors": exc.errors()},
@@ -81,7 +138,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception for {request.method} {request.url.path}", exc_info=True)  # Log traceback
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "An internal server error occurred. Please try again later."},
     )
@@ -90,11 +147,15 @@ async def general_exception_handler(request: Request, exc: Exception):
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
     # Code to run on startup
+    _start_log_listener()
     logger.info("Application startup...")
     # Initialize Supabase client here if needed, although get_supabase_admin_client handles it lazily
     await get_supabase_admin_client()
     yield
+    await close_http_client()
+    await close_boligsiden_client()
     logger.info("Shutdown complete.")
+    _stop_log_listener()
 
 
 # Assign the lifespan context manager to the app instance
@@ -117,9 +178,10 @@ if __name__ == "__main__":
         print("\n*** WARNING: Supabase Service Role Key seems unconfigured! Check .env file. ***\n")
 
     uvicorn.run(
-        app,
+        "src.app.main:app",  # Import string, so extra workers can import the app themselves
         host="127.0.0.1",
         port=8000,
         reload=False,
+        workers=settings.UVICORN_WORKERS,
         log_level="debug"
     )
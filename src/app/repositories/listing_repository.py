@@ -1,17 +1,57 @@
 import uuid
 import logging
-import json
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, cast, TypeVar, Union
+import time
+from collections import OrderedDict
+from typing import Optional, Any
 from postgrest import APIResponse
 from supabase import AsyncClient
 
 from src.app.lib.supabase_client import get_supabase_admin_client
 from src.app.schemas.status import AnalysisStatus
-from src.app.schemas.database import DatabaseSchema, TableName, SCHEMA_CONFIG, Listing
+from src.app.schemas.database import DatabaseSchema, TableName, Listing
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cache used by create_or_get_listing, so repeated submissions of the same
+# listing skip the lookup round trip. Only the small columns are kept (the HTML, text and
+# analysis payloads can be megabytes each); writes through this repository refresh the entry.
+# The cache is per process, so with several workers a status can lag by up to the TTL.
+_LISTING_CACHE_SIZE = 1024
+_LISTING_CACHE_TTL = 30  # seconds
+_LISTING_CACHE_EXCLUDE = frozenset({
+    "analysis", "html_url", "html_url_redirect", "text_extracted", "text_extracted_redirect",
+})
+# Entries keep insertion order, which with a fixed TTL is also expiry order
+_listing_cache: "OrderedDict[str, tuple[float, Listing]]" = OrderedDict()
+
+
+def _get_cached_listing(normalized_url: str) -> Optional[Listing]:
+    entry = _listing_cache.get(normalized_url)
+    if entry is None:
+        return None
+    expires_at, listing = entry
+    if expires_at < time.monotonic():
+        del _listing_cache[normalized_url]
+        return None
+    return listing.model_copy()  # Callers may mutate the listing they get back
+
+
+def _cache_listing(listing: Listing) -> None:
+    now = time.monotonic()
+    while _listing_cache:
+        oldest_expires_at, _ = next(iter(_listing_cache.values()))
+        if oldest_expires_at >= now:
+            break
+        _listing_cache.popitem(last=False)
+
+    light_listing = Listing.model_construct(
+        **{field: value for field, value in listing if field not in _LISTING_CACHE_EXCLUDE}
+    )
+    _listing_cache[listing.normalized_url] = (now + _LISTING_CACHE_TTL, light_listing)
+    _listing_cache.move_to_end(listing.normalized_url)
+    if len(_listing_cache) > _LISTING_CACHE_SIZE:
+        _listing_cache.popitem(last=False)
+
 
 class ListingRepository:
     """Repository for managing apartment listings in the database."""
@@ -65,7 +105,9 @@ class ListingRepository:
 
             if response.data and len(response.data) > 0:
                 if isinstance(response.data, list) and len(response.data) > 0:
-                    return Listing.from_db_dict(response.data[0])
+                    listing = Listing.from_db_dict(response.data[0])
+                    _cache_listing(listing)
+                    return listing
             return None
         except Exception as e:
             logger.error(f"Error finding listing by normalized URL {normalized_url}: {e}")
@@ -110,7 +152,9 @@ class ListingRepository:
 
             if response.data and len(response.data) > 0:
                 if isinstance(response.data, list) and len(response.data) > 0:
-                    return Listing.from_db_dict(response.data[0])
+                    listing = Listing.from_db_dict(response.data[0])
+                    _cache_listing(listing)
+                    return listing
             raise Exception("Failed to create listing, no data returned")
 
         except Exception as e:
@@ -131,8 +175,9 @@ class ListingRepository:
         if not self.supabase:
             raise RuntimeError("Supabase client not initialized")
 
-        listing.updated_at = datetime.now(timezone.utc)
+        # updated_at is set by the set_updated_at_trigger; the returned row carries the new value
         db_dict = listing.to_db_dict()
+        db_dict.pop("updated_at", None)
 
         try:
             # Use APIResponse[Any] for flexibility
@@ -143,7 +188,9 @@ class ListingRepository:
 
             if response.data and len(response.data) > 0:
                 if isinstance(response.data, list) and len(response.data) > 0:
-                    return Listing.from_db_dict(response.data[0])
+                    listing = Listing.from_db_dict(response.data[0])
+                    _cache_listing(listing)
+                    return listing
             raise Exception(f"Failed to update listing {listing.id}, no data returned")
         except Exception as e:
             logger.error(f"Error updating listing {listing.id}: {e}")
@@ -165,8 +212,7 @@ class ListingRepository:
             raise RuntimeError("Supabase client not initialized")
 
         update_payload = {
-            'status': status.value,
-            'updated_at': datetime.now(timezone.utc)
+            'status': status.value  # updated_at is set by the set_updated_at_trigger
         }
 
         try:
@@ -178,7 +224,9 @@ class ListingRepository:
 
             if response.data and len(response.data) > 0:
                 if isinstance(response.data, list) and len(response.data) > 0:
-                    return Listing.from_db_dict(response.data[0])
+                    listing = Listing.from_db_dict(response.data[0])
+                    _cache_listing(listing)
+                    return listing
             raise Exception(f"Failed to update status for listing {listing_id} to {status.value}. Supabase returned no data.")
         except Exception as e:
             logger.error(f"Error updating status for listing {listing_id} to {status.value}: {e}")
@@ -187,7 +235,17 @@ class ListingRepository:
     async def create_or_get_listing(self, url: str, normalized_url: str) -> Listing:
         """
         Find a listing by normalized URL or create a new one.
+
+        The insert is an upsert that ignores duplicates on normalized_url, so concurrent
+        requests for the same new URL don't fail on the unique constraint; the loser of
+        the race reads back the winner's row.
+        A listing seen within the last few seconds is returned from the cache, without
+        its content columns (analysis, HTML and extracted text).
         """
+        cached_listing = _get_cached_listing(normalized_url)
+        if cached_listing is not None:
+            return cached_listing
+
         existing_listing = await self.find_by_normalized_url(normalized_url)
         if existing_listing:
             return existing_listing
@@ -197,4 +255,24 @@ class ListingRepository:
             normalized_url=normalized_url,
             status=AnalysisStatus.PENDING
         )
-        return await self.create(new_listing)
\ No newline at end of file
+        if not self.supabase:
+            raise RuntimeError("Supabase client not initialized")
+
+        try:
+            # ON CONFLICT DO NOTHING: returns the new row, or no data if another request inserted it first
+            response: APIResponse[Any] = await self.supabase.schema(self.SCHEMA_NAME).table(self.TABLE_NAME) \
+                .upsert(new_listing.to_db_dict(), on_conflict="normalized_url", ignore_duplicates=True) \
+                .execute()
+
+            if response.data and isinstance(response.data, list):
+                listing = Listing.from_db_dict(response.data[0])
+                _cache_listing(listing)
+                return listing
+        except Exception as e:
+            logger.error(f"Error creating listing for URL {url}: {e}")
+            raise
+
+        concurrent_listing = await self.find_by_normalized_url(normalized_url)
+        if concurrent_listing:
+            return concurrent_listing
+        raise Exception(f"Failed to create or find listing for normalized URL {normalized_url}")
\ No newline at end of file
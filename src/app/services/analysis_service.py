@@ -27,8 +27,8 @@ class AnalysisService:
 
     async def submit_analysis(self, request: AnalysisRequest, background_tasks=None) -> Dict[str, Any]:
         validation_result = validate_listing_url(str(request.url))
-        if not validation_result["valid"]:
-            raise ValueError(validation_result["error"])
+        if not validation_result.valid:
+            raise ValueError(validation_result.error)
 
         url_str = str(request.url)
         normalized_url = normalize_url(url_str)
@@ -68,8 +68,8 @@ class AnalysisService:
                 logger.error(f"[{listing_id}] Listing not found. Aborting analysis task.")
                 return
 
-            listing.status = AnalysisStatus.FETCHING_HTML
-            listing = await self.listing_repository.save(listing)
+            # Status transitions only write the status column rather than re-sending the whole row
+            listing = await self.listing_repository.update_status(listing_id, AnalysisStatus.FETCHING_HTML)
 
             primary_html = await fetch_html_content(listing.url)
 
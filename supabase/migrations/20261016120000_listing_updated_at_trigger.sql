@@ -0,0 +1,20 @@
+-- Let the database own apartment_listings.updated_at instead of the API sending it on every write
+
+CREATE OR REPLACE FUNCTION "private"."set_updated_at_trigger_function"() RETURNS "trigger"
+    LANGUAGE "plpgsql"
+    AS $$
+BEGIN
+  NEW.updated_at := now();
+  RETURN NEW;
+END;
+$$;
+
+
+ALTER FUNCTION "private"."set_updated_at_trigger_function"() OWNER TO "postgres";
+
+
+CREATE OR REPLACE TRIGGER "set_updated_at_trigger" BEFORE UPDATE ON "private"."apartment_listings" FOR EACH ROW EXECUTE FUNCTION "private"."set_updated_at_trigger_function"();
+
+
+REVOKE ALL ON FUNCTION "private"."set_updated_at_trigger_function"() FROM PUBLIC;
+GRANT ALL ON FUNCTION "private"."set_updated_at_trigger_function"() TO "service_role";
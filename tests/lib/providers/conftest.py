@@ -0,0 +1,4 @@
+import os
+
+# FirecrawlApp refuses to initialize without an API key; set before any provider module is imported
+os.environ.setdefault("FIRECRAWL_API_KEY", "test-key")
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+import respx
+
+from src.app.lib.providers import boligsiden_provider
+from src.app.lib.providers.boligsiden_provider import BoligsidenProvider
+
+LISTING_URL = "https://www.boligsiden.dk/adresse/vej-1?udbud=abc123"
+REDIRECT_URL = "https://www.boligsiden.dk/viderestilling/abc123"
+FINAL_URL = "https://www.home.dk/sag/abc123"
+
+
+@pytest.fixture(autouse=True)
+async def reset_module_state():
+    boligsiden_provider._source_url_cache.clear()
+    yield
+    boligsiden_provider._source_url_cache.clear()
+    await boligsiden_provider.close_client()
+
+
+# --- Tests for _extract_source_url ---
+
+@respx.mock
+async def test_extract_source_url_follows_redirect():
+    respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+
+    assert await BoligsidenProvider()._extract_source_url(LISTING_URL) == FINAL_URL
+
+
+@respx.mock
+async def test_extract_source_url_caches_by_case_id():
+    route = respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+    provider = BoligsidenProvider()
+
+    await provider._extract_source_url(LISTING_URL)
+    # Different query string, same listing
+    result = await provider._extract_source_url(LISTING_URL + "&foo=bar")
+
+    assert result == FINAL_URL
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_extract_source_url_expired_entry_is_refetched(monkeypatch):
+    route = respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+    provider = BoligsidenProvider()
+
+    await provider._extract_source_url(LISTING_URL)
+    monkeypatch.setattr(boligsiden_provider, "_SOURCE_URL_TTL", -1)
+    boligsiden_provider._source_url_cache.clear()
+    await provider._extract_source_url(LISTING_URL)
+    await provider._extract_source_url(LISTING_URL)
+
+    assert route.call_count == 3
+
+
+async def test_extract_source_url_without_udbud_returns_none():
+    assert await BoligsidenProvider()._extract_source_url("https://www.boligsiden.dk/adresse/vej-1") is None
+
+
+@respx.mock
+async def test_extract_source_url_reads_udbud_after_other_params():
+    respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+
+    url = "https://www.boligsiden.dk/adresse/vej-1?foo=1&udbud=abc123#billeder"
+    assert await BoligsidenProvider()._extract_source_url(url) == FINAL_URL
+
+
+@respx.mock
+async def test_extract_source_url_requests_single_byte():
+    redirect = respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(206, content=b"<"))
+
+    assert await BoligsidenProvider()._extract_source_url(LISTING_URL) == FINAL_URL
+    assert redirect.calls.last.request.headers["Range"] == "bytes=0-0"
+
+
+@respx.mock
+async def test_extract_source_url_falls_back_when_range_rejected():
+    respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    final = respx.get(FINAL_URL).mock(side_effect=[httpx.Response(416), httpx.Response(200)])
+
+    assert await BoligsidenProvider()._extract_source_url(LISTING_URL) == FINAL_URL
+    assert "Range" not in final.calls.last.request.headers
+
+
+# --- Tests for parse_html ---
+
+@respx.mock
+async def test_parse_html_returns_text_and_source_link():
+    respx.get(REDIRECT_URL).mock(return_value=httpx.Response(302, headers={"Location": FINAL_URL}))
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+    html = (
+        "<html><body><p>Dejlig villa</p>"
+        "<p>RadonrisikoRadonrisikoen vurderes til at være ukendtUkendt</p>"
+        "<p>med have</p></body></html>"
+    )
+
+    result = await BoligsidenProvider().parse_html(LISTING_URL, html)
+
+    assert result.extracted_text == "Dejlig villa med have"
+    assert str(result.original_link) == FINAL_URL
+
+
+@respx.mock
+async def test_extract_source_url_unresolved_redirect_returns_none():
+    respx.get(REDIRECT_URL).mock(return_value=httpx.Response(200))
+
+    assert await BoligsidenProvider()._extract_source_url(LISTING_URL) is None
+
+
+@respx.mock
+async def test_parse_html_without_udbud_skips_redirect_lookup():
+    result = await BoligsidenProvider().parse_html(
+        "https://www.boligsiden.dk/adresse/vej-1", "<html><body><p>Dejlig villa</p></body></html>"
+    )
+
+    assert result.extracted_text == "Dejlig villa"
+    assert result.original_link is None
+    assert not respx.calls
+
+
+@respx.mock
+async def test_extract_source_url_quotes_case_id():
+    route = respx.get("https://www.boligsiden.dk/viderestilling/..%2Fadmin").mock(
+        return_value=httpx.Response(302, headers={"Location": FINAL_URL})
+    )
+    respx.get(FINAL_URL).mock(return_value=httpx.Response(200))
+
+    url = "https://www.boligsiden.dk/adresse/vej-1?udbud=..%2Fadmin"
+    assert await BoligsidenProvider()._extract_source_url(url) == FINAL_URL
+    assert route.called
@@ -0,0 +1,22 @@
+import pytest
+
+from src.app.lib.providers.danbolig_provider import DanboligProvider
+
+START = "Kun nødvendige formålOK til valgteTilpas"
+END = "## Kontakt os"
+
+# --- Tests for _clean_markdown ---
+
+@pytest.mark.parametrize(
+    "markdown, expected",
+    [
+        (f"cookie {START} listing text {END} footer", "listing text"),
+        (f"{START} a {START} listing text {END} b {END} footer", f"listing text {END} b"),
+        (f"listing text {END} footer", "listing text"),
+        (f"cookie {START} listing text", "listing text"),
+        ("listing text", "listing text"),
+        (f"{END} {START} reversed", f"{END} {START} reversed"),
+    ],
+)
+def test_clean_markdown(markdown, expected):
+    assert DanboligProvider()._clean_markdown(markdown) == expected
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from src.app.lib.providers.firecrawl_provider import FirecrawlProvider
+
+
+class FakeFirecrawl:
+    """Stands in for the synchronous FirecrawlApp SDK."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def scrape_url(self, url, params=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return {"markdown": f"# {url}", "metadata": {}}
+
+
+def _provider(fake: FakeFirecrawl) -> FirecrawlProvider:
+    provider = FirecrawlProvider()
+    provider.firecrawl = fake
+    return provider
+
+# --- Tests for parse_html ---
+
+async def test_parse_html_returns_markdown():
+    result = await _provider(FakeFirecrawl()).parse_html("https://nybolig.dk/bolig/1")
+
+    assert result.extracted_text == "# https://nybolig.dk/bolig/1"
+    assert str(result.original_link) == "https://nybolig.dk/bolig/1"
+
+# --- Tests for parse_many ---
+
+async def test_parse_many_keeps_order_and_runs_concurrently():
+    fake = FakeFirecrawl(delay=0.05)
+    urls = [f"https://nybolig.dk/bolig/{i}" for i in range(4)]
+
+    results = await _provider(fake).parse_many(urls)
+
+    assert [r.extracted_text for r in results] == [f"# {url}" for url in urls]
+    assert fake.max_in_flight > 1
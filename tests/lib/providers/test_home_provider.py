@@ -0,0 +1,55 @@
+import pytest
+
+from src.app.lib.providers.home_provider import HomeProvider
+
+# --- Tests for extract_image_url ---
+
+@pytest.mark.parametrize(
+    "html_content, expected_url",
+    [
+        (
+            "<html><head><meta property='og:image' content='https://home.dk/og.jpg'></head>"
+            "<body><div class='image-gallery-preview'><img src='https://home.dk/gallery.jpg'></div></body></html>",
+            "https://home.dk/og.jpg",
+        ),
+        (
+            '<html><head><meta content="https://home.dk/og.jpg?w=1&amp;h=2" property="og:image"></head></html>',
+            "https://home.dk/og.jpg?w=1&h=2",
+        ),
+        (
+            '<html><head><meta property="og:image" content="https://home.dk/it\'s.jpg"></head></html>',
+            "https://home.dk/it's.jpg",  # Apostrophe inside a double-quoted value
+        ),
+        (
+            "<html><head><meta content='https://home.dk/\"q\".jpg' property='og:image'></head></html>",
+            'https://home.dk/"q".jpg',
+        ),
+        (
+            "<html><body><img src='https://home.dk/first.jpg'>"
+            "<div class='image-gallery-preview active'><img src='/relative.jpg'><img src='https://home.dk/gallery.jpg'></div>"
+            "</body></html>",
+            "https://home.dk/gallery.jpg",
+        ),
+        (
+            "<html><body><header class='property-details-main__header'><img src='https://home.dk/header.jpg'></header></body></html>",
+            "https://home.dk/header.jpg",
+        ),
+        (
+            "<html><body><div class='image-gallery-previewer'><img src='https://home.dk/other.jpg'></div></body></html>",
+            "https://home.dk/other.jpg",  # Not the gallery class; found by the generic fallback
+        ),
+        ("<html><body><img src='/bolig.jpg'></body></html>", "https://home.dk/bolig.jpg"),
+        ("<html><body><p>No images</p></body></html>", None),
+        ("", None),
+    ],
+)
+async def test_extract_image_url(html_content, expected_url):
+    assert await HomeProvider().extract_image_url(html_content) == expected_url
+
+# --- Tests for parse_html ---
+
+@pytest.mark.parametrize("html_content", ["   \n ", "<!-- only a comment -->"])
+async def test_parse_html_on_empty_document(html_content):
+    result = await HomeProvider().parse_html("https://home.dk/sag/1", html_content)
+    assert result.extracted_text == ""
+    assert str(result.original_link) == "https://home.dk/sag/1"
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from src.app.lib.providers import json_ld_provider
+from src.app.lib.providers.json_ld_provider import JsonLdProvider
+
+
+def _page(*json_ld_blocks: str, body: str = "") -> str:
+    scripts = "".join(f"<script type='application/ld+json'>{block}</script>" for block in json_ld_blocks)
+    return f"<html><head>{scripts}</head><body>{body}</body></html>"
+
+# --- Tests for can_handle ---
+
+@pytest.mark.parametrize(
+    "html_content, expected",
+    [
+        (_page("{}"), True),
+        ("<html><body><script>var x = 1;</script></body></html>", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_can_handle(html_content, expected):
+    assert JsonLdProvider().can_handle("https://nybolig.dk/bolig/1", html_content) is expected
+
+# --- Tests for extract_image_url ---
+
+@pytest.mark.parametrize(
+    "html_content, expected_url",
+    [
+        (_page(json.dumps({"image": "https://cdn.dk/a.jpg"})), "https://cdn.dk/a.jpg"),
+        (_page(json.dumps([{"name": "x"}, {"image": ["https://cdn.dk/b.jpg"]}])), "https://cdn.dk/b.jpg"),
+        (_page(json.dumps({"offers": {"itemOffered": {"image": "https://cdn.dk/c.jpg"}}})), "https://cdn.dk/c.jpg"),
+        (_page("{not json", json.dumps({"image": "https://cdn.dk/d.jpg"})), "https://cdn.dk/d.jpg"),
+        (_page(json.dumps({"image": {"@type": "ImageObject", "url": "https://cdn.dk/e.jpg"}})), "https://cdn.dk/e.jpg"),
+        (_page(json.dumps({"@graph": [{"@type": "WebPage", "url": "https://nybolig.dk/1"}, {"thumbnailUrl": "https://cdn.dk/f.jpg"}]})), "https://cdn.dk/f.jpg"),
+        (_page(json.dumps({"offers": {"itemOffered": {"image": "https://cdn.dk/nested.jpg"}}, "image": "https://cdn.dk/top.jpg"})), "https://cdn.dk/top.jpg"),
+        (_page(json.dumps({"image": ["/relative.jpg", "https://cdn.dk/g.jpg"]})), "https://cdn.dk/g.jpg"),
+        (_page("{}", body="<img src='https://cdn.dk/fallback.jpg'>"), "https://cdn.dk/fallback.jpg"),
+        (_page("{}"), None),
+    ],
+)
+async def test_extract_image_url(html_content, expected_url):
+    assert await JsonLdProvider().extract_image_url(html_content) == expected_url
+
+# --- Tests for parse_html ---
+
+async def test_parse_html_combines_json_ld_and_text():
+    html_content = _page(
+        json.dumps({"@type": "House", "name": "Villa"}),
+        json.dumps([{"@type": "Offer", "price": 1}]),
+        body="<p>Dejlig villa</p>",
+    )
+
+    result = await JsonLdProvider().parse_html("https://nybolig.dk/bolig/1", html_content)
+
+    json_part, text_part = result.extracted_text.split("\n\nExtracted Page Text:\n")
+    assert json.loads(json_part.removeprefix("JSON-LD Data:\n")) == [
+        {"@type": "House", "name": "Villa"},
+        {"@type": "Offer", "price": 1},
+    ]
+    assert text_part == "Dejlig villa"
+    assert str(result.original_link) == "https://nybolig.dk/bolig/1"
+
+
+@pytest.mark.parametrize("html_content", ["  \n\t ", "<!-- nothing here -->"])
+async def test_parse_html_on_empty_document(html_content):
+    result = await JsonLdProvider().parse_html("https://nybolig.dk/bolig/1", html_content)
+    assert result.extracted_text == "JSON-LD Data:\n[]\n\nExtracted Page Text:\n"
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ('{"price": NaN, "area": Infinity}', [{"price": None, "area": None}]),  # Accepted by json; written as null
+        ('{"price": 1.5e400}', [{"price": None}]),
+        ('{"id": 123456789012345678901234567890}', [{"id": 1.2345678901234568e29}]),  # Wider than 64 bits: read as a float
+        ('{"name": ', []),
+    ],
+)
+async def test_parse_html_decodes_non_standard_json_ld(raw, expected):
+    result = await JsonLdProvider().parse_html("https://nybolig.dk/bolig/1", _page(raw))
+
+    json_part = result.extracted_text.split("\n\nExtracted Page Text:\n")[0]
+    assert json.loads(json_part.removeprefix("JSON-LD Data:\n")) == expected
+
+
+async def test_parse_html_skips_oversized_json_ld(monkeypatch):
+    small = json.dumps({"name": "Villa"})
+    large = json.dumps({"name": "x" * 100})
+    monkeypatch.setattr(json_ld_provider, "MAX_JSON_LD_SCRIPT_CHARS", len(small))
+
+    result = await JsonLdProvider().parse_html("https://nybolig.dk/bolig/1", _page(large, small))
+
+    json_part = result.extracted_text.split("\n\nExtracted Page Text:\n")[0]
+    assert json.loads(json_part.removeprefix("JSON-LD Data:\n")) == [{"name": "Villa"}]
+
+
+async def test_parse_html_stops_at_total_json_ld_cap(monkeypatch):
+    block = json.dumps({"name": "Villa"})
+    monkeypatch.setattr(json_ld_provider, "MAX_JSON_LD_TOTAL_CHARS", len(block) * 2)
+
+    result = await JsonLdProvider().parse_html("https://nybolig.dk/bolig/1", _page(block, block, block))
+
+    json_part = result.extracted_text.split("\n\nExtracted Page Text:\n")[0]
+    assert len(json.loads(json_part.removeprefix("JSON-LD Data:\n"))) == 2
@@ -0,0 +1,23 @@
+import pytest
+
+from src.app.lib.providers.provider_registry import get_provider_registry
+
+JSON_LD_HTML = "<html><head><script type='application/ld+json'>{}</script></head><body></body></html>"
+
+# --- Tests for get_provider_for_content ---
+
+@pytest.mark.parametrize(
+    "url, html_content, expected_provider",
+    [
+        ("https://www.boligsiden.dk/adresse/vej-1?udbud=123", None, "Boligsiden.dk"),
+        ("https://home.dk/boliger/123", None, "Home.dk"),
+        ("https://danbolig.dk/bolig/123", None, "Danbolig"),
+        ("https://edc.dk/bolig/123", JSON_LD_HTML, "EDC"),
+        ("https://edc.dk/bolig/123", None, "Firecrawl"), # EDC requires JSON-LD content
+        ("https://nybolig.dk/bolig/123", JSON_LD_HTML, "JSON-LD Provider"),
+        ("https://nybolig.dk/bolig/123", None, "Firecrawl"),
+    ],
+)
+def test_get_provider_for_content(url, html_content, expected_provider):
+    provider = get_provider_registry().get_provider_for_content(url, html_content)
+    assert provider.name == expected_provider
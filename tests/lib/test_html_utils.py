@@ -1,5 +1,8 @@
+import httpx
 import pytest
-from src.app.lib.html_utils import extract_text_from_html, extract_first_image_url
+import respx
+from src.app.lib import html_utils
+from src.app.lib.html_utils import extract_text_from_html, extract_first_image_url, parse_html_tree
 
 # --- Tests for extract_text_from_html ---
 
@@ -43,6 +46,10 @@ from src.app.lib.html_utils import extract_text_from_html, extract_first_image_u
             "<html><body><!-- Comment --> Visible text</body></html>", # HTML comments
             "Visible text",
         ),
+        (
+            "<html><head><meta charset='iso-8859-1'></head><body>Bolig på Østerbro</body></html>".encode('iso-8859-1'),
+            "Bolig på Østerbro", # Bytes decoded using the declared charset
+        ),
     ],
 )
 async def test_extract_text_from_html(html_content, expected_text):
@@ -78,6 +85,12 @@ async def test_extract_text_from_html(html_content, expected_text):
             "http://example.com",
             "http://example.com/main.png", # Skips svg, takes png
         ),
+        # Filter markers are matched case-insensitively
+        (
+            "<html><body><img src='/img/Company-LOGO.PNG'><img src='photo.JPG'></body></html>",
+            "http://example.com",
+            "http://example.com/photo.JPG",
+        ),
         # Image inside link
         (
             "<html><body><a><img src='linked_image.jpeg'></a></body></html>",
@@ -112,7 +125,7 @@ async def test_extract_text_from_html(html_content, expected_text):
         (
             "<html><body><img src='valid.jpg' </body</html>", # Malformed tag
             "http://example.com",
-            "http://example.com/valid.jpg", # BeautifulSoup might still parse it
+            "http://example.com/valid.jpg", # lxml recovers the malformed tag
         ),
         # og:image takes precedence over img, even if img comes first
         (
@@ -126,6 +139,18 @@ async def test_extract_text_from_html(html_content, expected_text):
              "http://example.com",
              "http://example.com/og_caps.jpg",
         ),
+        # twitter:image used when no og:image is present
+        (
+             "<html><head><meta name='twitter:image' content='tw.jpg'></head><body><img src='first.png'></body></html>",
+             "http://example.com",
+             "http://example.com/tw.jpg",
+        ),
+        # og:image takes precedence over twitter:image regardless of order
+        (
+             "<html><head><meta name='twitter:image:src' content='tw.jpg'><meta property='og:image' content='og.jpg'></head></html>",
+             "http://example.com",
+             "http://example.com/og.jpg",
+        ),
         # Base URL variations
         (
             "<html><body><img src='relative.png'></body></html>",
@@ -152,4 +177,73 @@ async def test_extract_text_from_html(html_content, expected_text):
     ],
 )
 async def test_extract_first_image_url(html_content, base_url, expected_image_url):
-    assert await extract_first_image_url(html_content, base_url) == expected_image_url
\ No newline at end of file
+    assert await extract_first_image_url(html_content, base_url) == expected_image_url
+
+# --- Tests for sharing a parsed tree ---
+
+@pytest.mark.parametrize("html_content", ["   \n ", "<!-- only a comment -->"])
+async def test_parse_html_tree_handles_empty_document(html_content):
+    tree = parse_html_tree(html_content)
+    assert await extract_text_from_html(tree) == ""
+    assert await extract_first_image_url(tree, "http://example.com") is None
+
+async def test_parsed_tree_is_shared_between_extractors():
+    tree = parse_html_tree(
+        "<html><head><title>T</title></head><body><script>x</script><p>Body</p><img src='photo.jpg'></body></html>"
+    )
+    assert await extract_text_from_html(tree) == "T Body"
+    # Text extraction must leave the tree intact for the image lookup
+    assert await extract_first_image_url(tree, "http://example.com") == "http://example.com/photo.jpg"
+    assert await extract_text_from_html(tree) == "T Body"
+
+
+
+async def test_xhtml_with_xml_declaration_is_parsed():
+    xhtml = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>T</title>'
+        '<meta property="og:image" content="http://example.com/og.jpg"/></head>'
+        '<body><p>Hello</p></body></html>'
+    )
+    assert await extract_text_from_html(xhtml) == "T Hello"
+    assert await extract_first_image_url(xhtml, "http://example.com") == "http://example.com/og.jpg"
+
+
+async def test_unterminated_xml_declaration_is_left_in_place():
+    # Without a closing '?>' nothing is stripped, so no character of the document is lost
+    assert await extract_text_from_html('<?xml version="1.0"<html><body><p>Hello</p></body></html>') == "Hello"
+
+
+# --- Tests for fetch_html_content ---
+
+@pytest.fixture
+async def http_client_cleanup():
+    yield
+    await html_utils.close_http_client()
+
+async def test_fetch_html_content_returns_body(http_client_cleanup):
+    with respx.mock:
+        respx.get("http://example.com/listing").mock(
+            return_value=httpx.Response(200, text="<html><body>Hej</body></html>")
+        )
+        assert await html_utils.fetch_html_content("http://example.com/listing") == "<html><body>Hej</body></html>"
+
+async def test_fetch_html_content_truncates_large_bodies(http_client_cleanup, monkeypatch):
+    monkeypatch.setattr(html_utils, "MAX_HTML_BYTES", 10)
+    with respx.mock:
+        respx.get("http://example.com/big").mock(return_value=httpx.Response(200, text="x" * 100))
+        assert await html_utils.fetch_html_content("http://example.com/big") == "x" * 10
+
+async def test_fetch_html_content_raises_on_http_error(http_client_cleanup):
+    with respx.mock:
+        respx.get("http://example.com/missing").mock(return_value=httpx.Response(404))
+        with pytest.raises(ValueError):
+            await html_utils.fetch_html_content("http://example.com/missing")
+
+async def test_fetch_many_preserves_order(http_client_cleanup):
+    with respx.mock:
+        respx.get("http://example.com/a").mock(return_value=httpx.Response(200, text="A"))
+        respx.get("http://example.com/b").mock(return_value=httpx.Response(200, text="B"))
+        urls = ["http://example.com/b", "http://example.com/a", "http://example.com/b"]
+        assert await html_utils.fetch_many(urls, concurrency=2) == ["B", "A", "B"]
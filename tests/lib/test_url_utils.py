@@ -4,6 +4,7 @@ from src.app.lib.url_utils import (
     extract_domain,
     is_absolute_url,
     resolve_url,
+    to_http_url,
 )
 
 # --- Tests for normalize_url ---
@@ -94,4 +95,20 @@ def test_is_absolute_url(input_url, expected_output):
     ],
 )
 def test_resolve_url(base_url, relative_url, expected_output):
-    assert resolve_url(base_url, relative_url) == expected_output
\ No newline at end of file
+    assert resolve_url(base_url, relative_url) == expected_output
+
+# --- Tests for to_http_url ---
+
+@pytest.mark.parametrize(
+    "input_url, expected_output",
+    [
+        ("https://example.com/path?a=1", "https://example.com/path?a=1"),
+        ("http://example.com", "http://example.com/"),
+        ("ftp://example.com/file", None),
+        ("invalid-url", None),
+        ("", None),
+    ],
+)
+def test_to_http_url(input_url, expected_output):
+    result = to_http_url(input_url)
+    assert (str(result) if result is not None else None) == expected_output
@@ -0,0 +1,38 @@
+import pytest
+from src.app.lib.url_validation import validate_listing_url
+
+# --- Tests for validate_listing_url ---
+
+@pytest.mark.parametrize(
+    "url, expected_valid",
+    [
+        ("https://www.boligsiden.dk/adresse/vej-1?udbud=abc123", True),
+        ("https://www.boligsiden.dk/adresse/vej-1?foo=1&udbud=abc123", True),
+        ("https://www.boligsiden.dk/adresse/vej-1", False), # Missing udbud
+        ("https://www.boligsiden.dk/adresse/vej-1?xudbud=abc123", False), # Not the udbud parameter
+        ("https://www.boligsiden.dk/adresse/vej-1?x=a=b&udbud=abc123", True), # Odd params don't break the check
+        ("https://www.boligsiden.dk/viewpage/vej-1?udbud=abc123", False),
+        ("https://home.dk/boliger/123", True),
+        ("https://www.nybolig.dk/villa/123", True),
+        ("https://HOME.DK/boliger/123", True),
+        ("https://home.dk/ViewPage/123", False),
+        ("https://example.com/bolig/123", False),
+        ("HTTPS://home.dk/boliger/123", True),
+        ("ftp://home.dk/boliger/123", False),
+        ("home.dk/boliger/123", False), # No scheme
+        ("https://home.dk/" + "a" * 2048, False), # Too long
+        ("", False),
+    ],
+)
+def test_validate_listing_url(url, expected_valid):
+    result = validate_listing_url(url)
+    assert result.valid is expected_valid
+    assert (result.error is not None) is not expected_valid
+
+
+def test_validate_listing_url_result_is_cached_and_read_only():
+    url = "https://example.com/bolig/123"
+    result = validate_listing_url(url)
+    assert validate_listing_url(url) is result
+    with pytest.raises(AttributeError):
+        result.valid = True
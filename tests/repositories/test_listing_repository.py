@@ -15,6 +15,7 @@ from supabase import Client, create_client, AsyncClient
 from postgrest import APIResponse
 # Commented out as CountMethod might not exist in postgrest.utils
 # from postgrest.utils import CountMethod
+from src.app.repositories import listing_repository
 from src.app.repositories.listing_repository import ListingRepository
 from src.app.schemas.status import AnalysisStatus
 from src.app.schemas.database import Listing
@@ -64,6 +65,7 @@ async def cleanup_listings(db_client: AsyncClient) -> AsyncGenerator[List[uuid.U
     yield created_listing_ids # Hand control to the test
 
     # --- Teardown ---
+    listing_repository._listing_cache.clear() # Rows are deleted behind the repository's back
     if not created_listing_ids:
         return
 